@@ -2,19 +2,39 @@
 Snake AI — Decision Policy (updated with Smart Finisher)
 
 Decision pipeline:
-0) FINISHER: EAT if safe (check for suicide).
+0) ENDGAME: exact solver (`endgame.Endgame`) for the last few empty cells;
+   over its node budget the heuristic below decides.
+0b) FINISHER: EAT if safe (check for suicide).
 1) STARVATION: Force aggressive move if stuck.
 2) EARLY GAME: BFS shortest path.
 3) END GAME: Circulate safely.
+
+`HeuristicPolicy` (registered as "heuristic") keeps the starvation and
+anti-loop counters itself. Its thresholds live in a `HeuristicParams`
+(`make_policy("heuristic", tail_fill=0.75)` overrides single fields;
+`tune.py` searches them):
+- `starve_factor`: moves per cell without food before starving mode,
+- `stuck_factor`: anti-loop limit in units of cols + rows,
+- `tail_fill`: fill ratio where tail-following takes over,
+- `finisher_empty`: free cells at which the finisher eats greedily; on boards
+  under `finisher_small_cells` cells from `finisher_small_empty` already,
+- `endgame_empty`: free cells at which the exact solver starts (0: off),
+  `endgame_nodes`: its budget per decision in stage expansions (<= 0: none),
+  `endgame_ms`: an optional wall-clock cap on top (<= 0: off, the default;
+  a time cap makes games depend on machine load),
+- `area_term`: rank refuge moves first by the free cells they would cut off
+  (incremental `regions.Regions`), so pocket-making moves come last.
 """
 
-from typing import Tuple, List, Optional
-from collections import deque
+from dataclasses import dataclass, replace
+from typing import Tuple, List, Optional, Any
 
+from endgame import Endgame
 from heuristics import manhattan
-from grid import neighbors, in_bounds
-from search import bfs_path
-from simulate import safe_neighbors, simulate_path_and_check_safety, connected
+from instrument import stage
+from grid import neighbors
+from policy import register
+from simulate import TickContext, simulate_path_and_check_safety
 
 Pos = Tuple[int, int]
 
@@ -23,169 +43,239 @@ def get_valid_moves_after_eat(game, eat_pos: Pos) -> int:
     Eğer 'eat_pos' konumundaki yemi yersem, bir sonraki turda
     kafamın etrafında kaç tane geçerli (duvar/kuyruk olmayan) boşluk kalır?
     """
-    # Sanal bir yılan oluştur
-    sim_snake = deque(game.snake)
-    sim_snake.appendleft(eat_pos)
-    # Yediğimiz için kuyruğu atmıyoruz (pop yapmıyoruz), yılan uzuyor.
-    
-    sim_head = sim_snake[0]
+    # Yediğimiz için kuyruk kalıyor, yılan uzuyor: yeni kafanın komşuları
+    # mevcut gövdeye göre kontrol edilir (kopya gerekmez).
+    snake = game.snake
     valid_count = 0
     
-    # Yeni kafa pozisyonundan komşulara bak
-    candidate_moves = [(sim_head[0]+1, sim_head[1]), (sim_head[0]-1, sim_head[1]),
-                       (sim_head[0], sim_head[1]+1), (sim_head[0], sim_head[1]-1)]
-    
-    for nxt in candidate_moves:
-        if in_bounds(nxt) and nxt not in sim_snake:
+    # Yeni kafa pozisyonundan komşulara bak (önceden hesaplanmış tablo, sınır kontrolü yok)
+    for j in snake.adj[snake.index(eat_pos)]:
+        if not snake.occ[j]:
             valid_count += 1
             
     return valid_count
 
-def choose_move(game) -> Pos:
-    head = game.snake[0]
-    body = list(game.snake)
-    tail = game.snake[-1]
+@dataclass(frozen=True)
+class HeuristicParams:
+    """HeuristicPolicy eşikleri; alan adları aynı zamanda make_policy / --policy-opt seçenekleri."""
+    starve_factor: float = 2.0
+    stuck_factor: float = 1.0
+    tail_fill: float = 0.80
+    finisher_empty: int = 3
+    finisher_small_empty: int = 8
+    finisher_small_cells: int = 50
+    endgame_empty: int = 6
+    endgame_nodes: int = 5000
+    endgame_ms: float = 0.0
+    area_term: bool = True
+
+@register("heuristic")
+class HeuristicPolicy:
+    def __init__(self, params: Optional[HeuristicParams] = None, **overrides: Any):
+        self.params = replace(params or HeuristicParams(), **overrides)
+        self.endgame: Optional[Endgame] = None
+        self.reset(None)
+
+    def reset(self, game) -> None:
+        # Çözücü tahta başına bir kez kurulur; tablosu her oyunda boş başlar
+        p = self.params
+        if game is not None and p.endgame_empty > 0 and \
+                (self.endgame is None or self.endgame.board is not game.board):
+            self.endgame = Endgame(game.board, p.endgame_empty, p.endgame_ms, budget_nodes=p.endgame_nodes)
+        elif self.endgame is not None:
+            self.endgame.clear()
+
+        # Starvation takibi
+        self.moves_since_eat = 0
+        self.prev_score = game.score if game is not None else 0
+
+        # Anti-loop / stuck state
+        self.last_score = self.prev_score
+        self.last_food = game.food if game is not None else None
+        self.last_dist = manhattan(game.snake[0], game.food) if game is not None else 0
+        self.stuck_counter = 0
+        self.jitter_phase = 0
+
+    STATE = ("moves_since_eat", "prev_score", "last_score", "last_food", "last_dist",
+             "stuck_counter", "jitter_phase")
+
+    def get_state(self) -> dict:
+        state = {name: getattr(self, name) for name in self.STATE}
+        # Tablo kopyalanmaz: snapshot anında boşaltılır, geri yüklenen oyun da boş tabloyla
+        # başlar (reset), böylece düğüm bütçesi ikisinde de aynı yerde biter
+        endgame = self.endgame
+        state["endgame_plan"] = endgame.plan if endgame is not None else None
+        if endgame is not None:
+            endgame.table.clear()
+        return state
+
+    def set_state(self, state: dict) -> None:
+        for name in self.STATE:
+            setattr(self, name, state[name])
+        if self.endgame is not None:
+            self.endgame.table.clear()
+            self.endgame.plan = state.get("endgame_plan")
+
+    def decide(self, game) -> Pos:
+        p = self.params
+        head = game.snake[0]
+        tail = game.snake[-1]
+        # Bu tick'in BFS / bölge sonuçları aşamalar arasında paylaşılır
+        ctx = TickContext(game)
     
-    # --- Starvation Takibi ---
-    if not hasattr(game, 'moves_since_eat'):
-        game.moves_since_eat = 0
-        game.prev_score = game.score
-
-    if game.score != game.prev_score:
-        game.moves_since_eat = 0
-        game.prev_score = game.score
-    else:
-        game.moves_since_eat += 1
-
-    total_cells = game.cols * game.rows
-    # Açlık Sınırı
-    IS_STARVING = (game.moves_since_eat > total_cells * 2)
-
-    # =========================================================================
-    # 0) AKILLI SON VURUŞ (SMART FINISHER)
-    # =========================================================================
-    empty_slots = total_cells - len(game.snake)
+        # --- Starvation Takibi ---
+        if game.score != self.prev_score:
+            self.moves_since_eat = 0
+            self.prev_score = game.score
+        else:
+            self.moves_since_eat += 1
+
+        total_cells = game.cols * game.rows
+        # Açlık Sınırı
+        IS_STARVING = (self.moves_since_eat > total_cells * p.starve_factor)
+
+        # =========================================================================
+        # 0) AKILLI SON VURUŞ (SMART FINISHER)
+        # =========================================================================
+        empty_slots = total_cells - len(game.snake)
+
+        # Kesin çözücü; bütçe aşılırsa (boş sözlük) aşağıdaki finisher karar verir
+        if self.endgame is not None and empty_slots <= p.endgame_empty:
+            with stage("endgame"):
+                scores = self.endgame.score_moves(game)
+            if scores:
+                best = max(scores, key=scores.get)
+                if scores[best] > 0.0:
+                    game.status = "endgame_exact"
+                    return best
     
-    # Küçük haritalarda (6x6, 5x5) sonlara doğru devreye girer
-    if empty_slots <= 3 or (total_cells < 50 and empty_slots <= 8):
-        for nb in neighbors(head):
-            if nb == game.food:
-                # KURAL 1: Yem yılanın kendi gövdesi değil (Temel kural)
-                if nb not in game.snake:
+        # Küçük haritalarda (6x6, 5x5) sonlara doğru devreye girer
+        if empty_slots <= p.finisher_empty or \
+                (total_cells < p.finisher_small_cells and empty_slots <= p.finisher_small_empty):
+            with stage("finisher"):
+                for nb in neighbors(head, game.board):
+                    if nb == game.food:
+                        # KURAL 1: Yem yılanın kendi gövdesi değil (Temel kural)
+                        if nb not in game.snake:
                     
-                    # ÖZEL DURUM: Eğer bu SON YEM ise (Oyun Bitiyor), düşünme YE!
-                    if empty_slots == 1:
-                        game.status = "WINNING_MOVE"
-                        return nb
+                            # ÖZEL DURUM: Eğer bu SON YEM ise (Oyun Bitiyor), düşünme YE!
+                            if empty_slots == 1:
+                                game.status = "WINNING_MOVE"
+                                return nb
                     
-                    # KURAL 2 (YENİ): İntihar Kontrolü
-                    # Yediğimde hareket edecek yerim kalıyor mu?
-                    future_moves = get_valid_moves_after_eat(game, nb)
+                            # KURAL 2 (YENİ): İntihar Kontrolü
+                            # Yediğimde hareket edecek yerim kalıyor mu?
+                            future_moves = get_valid_moves_after_eat(game, nb)
                     
-                    if future_moves > 0:
-                        game.status = "SMART_FINISH"
-                        return nb
-                    else:
-                        # Eğer yersem öleceğim, o yüzden yeme!
-                        # Normal "Circulate" moduna düşüp kuyruğu takip etsin.
-                        pass
-
-    # =========================================================================
+                            if future_moves > 0:
+                                game.status = "SMART_FINISH"
+                                return nb
+                            else:
+                                # Eğer yersem öleceğim, o yüzden yeme!
+                                # Normal "Circulate" moduna düşüp kuyruğu takip etsin.
+                                pass
+
+        # =========================================================================
     
-    # --- stuck takibi ---
-    if game.score == game.last_score and game.food == game.last_food:
-        dist = manhattan(head, game.food)
-        if dist >= game.last_dist:
-            game.stuck_counter += 1
+        # --- stuck takibi ---
+        if game.score == self.last_score and game.food == self.last_food:
+            dist = manhattan(head, game.food)
+            if dist >= self.last_dist:
+                self.stuck_counter += 1
+            else:
+                self.stuck_counter = max(0, self.stuck_counter - 1)
+            self.last_dist = dist
         else:
-            game.stuck_counter = max(0, game.stuck_counter - 1)
-        game.last_dist = dist
-    else:
-        game.stuck_counter = 0
-        game.last_score = game.score
-        game.last_food = game.food
-        game.last_dist = manhattan(head, game.food)
-
-    STUCK_LIMIT = game.cols + game.rows 
-
-    # --- 1) Anti-Loop (Food locked?) ---
-    blocked_except_tail = set(body)
-    if tail in blocked_except_tail:
-        blocked_except_tail.remove(tail)
+            self.stuck_counter = 0
+            self.last_score = game.score
+            self.last_food = game.food
+            self.last_dist = manhattan(head, game.food)
+
+        STUCK_LIMIT = p.stuck_factor * (game.cols + game.rows)
+
+        # --- 1) Anti-Loop (Food locked?) ---
+        with stage("connected"):
+            food_locked = game.food is not None and not ctx.connected(game.food, tail)
+
+        if food_locked:
+            with stage("safe_neighbors"):
+                safe = ctx.safe_neighbors()
+            if safe:
+                fx, fy = game.food
+                if self.stuck_counter > STUCK_LIMIT:
+                    self.jitter_phase ^= 1
+                    self.stuck_counter = 0
+
+                def score_move(c: Pos):
+                    return (abs(c[0]-fx)+abs(c[1]-fy), manhattan(c, tail))
+
+                safe.sort(key=score_move, reverse=True)
+                choice = safe[0]
+                if self.jitter_phase and len(safe) >= 2:
+                    choice = safe[1]
+                game.status = "unlock_food_via_tail"
+                return choice
+
+        # --- KRİTİK EŞİK ---
+        fill_ratio = len(game.snake) / total_cells
+        force_tail_mode = (fill_ratio > p.tail_fill)
+
+        if IS_STARVING:
+            force_tail_mode = False
+
+        # --- 2) Yemeğe git (BFS) ---
+        if not force_tail_mode:
+            with stage("bfs_food"):
+                food_path = ctx.path_to(game.food)
         
-    if game.food is not None and not connected(game.food, tail, blocked_except_tail):
-        safe = safe_neighbors(game)
+            with stage("path_safety"):
+                food_safe = bool(food_path) and simulate_path_and_check_safety(game, food_path)
+            if food_safe:
+                game.status = "shortest_to_food"
+                if IS_STARVING: game.status += " (STARVING)"
+                return food_path[1] if len(food_path) >= 2 else head
+
+        # --- 3) Kuyruğa sığın ---
+        with stage("safe_neighbors"):
+            safe = ctx.safe_neighbors()
         if safe:
-            fx, fy = game.food
-            if game.stuck_counter > STUCK_LIMIT:
-                game.jitter_phase ^= 1
-                game.stuck_counter = 0
+            fx, fy = game.food if game.food else (head[0], head[1])
 
             def score_move(c: Pos):
-                return (abs(c[0]-fx)+abs(c[1]-fy), manhattan(c, tail))
+                dist_tail = manhattan(c, tail)
+                dist_food = abs(c[0]-fx)+abs(c[1]-fy)
+                # Bölge terimi: hamlenin yılandan kopardığı boş hücreler (cep bırakan hamle geride)
+                cut = -ctx.move_cutoff(c) if p.area_term else 0
+            
+                if IS_STARVING:
+                    return (cut, dist_tail, -dist_food) 
+                else:
+                    return (cut, dist_tail, dist_food)
 
             safe.sort(key=score_move, reverse=True)
-            choice = safe[0]
-            if game.jitter_phase and len(safe) >= 2:
-                choice = safe[1]
-            game.status = "unlock_food_via_tail"
-            return choice
-
-    # --- KRİTİK EŞİK ---
-    fill_ratio = len(game.snake) / total_cells
-    force_tail_mode = (fill_ratio > 0.80)
-
-    if IS_STARVING:
-        force_tail_mode = False
-
-    # --- 2) Yemeğe git (BFS) ---
-    if not force_tail_mode:
-        blocked_for_food = set(body)
-        food_path = bfs_path(head, game.food, blocked_for_food)
         
-        if food_path and simulate_path_and_check_safety(game, food_path):
-            game.status = "shortest_to_food"
-            if IS_STARVING: game.status += " (STARVING)"
-            return food_path[1] if len(food_path) >= 2 else head
-
-    # --- 3) Kuyruğa sığın ---
-    safe = safe_neighbors(game)
-    if safe:
-        fx, fy = game.food if game.food else (head[0], head[1])
-
-        def score_move(c: Pos):
-            dist_tail = manhattan(c, tail)
-            dist_food = abs(c[0]-fx)+abs(c[1]-fy)
-            
-            if IS_STARVING:
-                return (dist_tail, -dist_food) 
+            if (IS_STARVING or self.stuck_counter > STUCK_LIMIT) and len(safe) >= 2:
+                 if self.moves_since_eat % 2 == 1:
+                     return safe[1]
+
+            if force_tail_mode:
+                game.status = "endgame_circulate"
             else:
-                return (dist_tail, dist_food)
+                game.status = "to_tail_safe"
+            
+            return safe[0]
 
-        safe.sort(key=score_move, reverse=True)
-        
-        if (IS_STARVING or game.stuck_counter > STUCK_LIMIT) and len(safe) >= 2:
-             if game.moves_since_eat % 2 == 1:
-                 return safe[1]
+        # --- 4) Fallback ---
+        game.status = "fallback_safe_neighbor"
+        cand: List[Pos] = []
+        for nb in neighbors(head, game.board):
+            cand.append(nb)
+        if cand:
+            fx, fy = game.food if game.food else (head[0], head[1])
+            cand.sort(key=lambda c: (-abs(c[0]-fx)-abs(c[1]-fy), -manhattan(c, tail)))
+            pick = cand[0]
+            if self.jitter_phase and len(cand) >= 2:
+                pick = cand[1]
+            return pick
 
-        if force_tail_mode:
-            game.status = "endgame_circulate"
-        else:
-            game.status = "to_tail_safe"
-            
-        return safe[0]
-
-    # --- 4) Fallback ---
-    game.status = "fallback_safe_neighbor"
-    cand: List[Pos] = []
-    for nb in neighbors(head):
-        cand.append(nb)
-    if cand:
-        fx, fy = game.food if game.food else (head[0], head[1])
-        cand.sort(key=lambda c: (-abs(c[0]-fx)-abs(c[1]-fy), -manhattan(c, tail)))
-        pick = cand[0]
-        if game.jitter_phase and len(cand) >= 2:
-            pick = cand[1]
-        return pick
-
-    return head
\ No newline at end of file
+        return head
\ No newline at end of file
@@ -0,0 +1,253 @@
+"""
+Snake AI — Batched Lockstep Environment (NumPy, optional)
+
+Holds B games of one board size as arrays and advances all of them with one
+`step(actions)` call, for policy evaluation at scale:
+- `occ`    (B, cells) uint8  per-cell body counts (as `SnakeBody.occ`),
+- `body`   (B, cells) int32  ring buffers of cell indices, `head`/`length`,
+- `food`   (B,)       int32  food cell (-1 once the board is full),
+- `pool`, `where`, `nfree`   per-game free-cell pools (as `state.FreeCells`),
+- `alive`, `score`, `steps`, `cause` (0 none, 1 wall, 2 body) per game.
+A game that fills the board stops like `HeadlessGame.logic_tick`: `alive`
+drops with cause 0 and `won` is set.
+Actions are direction codes in `recording.DIRS` order: +x, -x, +y, -y.
+
+Rules are those of `physics.step_once`: leaving the board or hitting the body
+kills, moving onto the cell the tail is leaving is allowed unless that move
+eats, eating grows the body by one. Food is uniform over the free cells like
+`spawn_food`: the free-cell pools are swap-remove arrays updated in the same
+order as `step_once` updates `game.free`, and food #k of game b is
+`pool[(splitmix64(seed + b, k) * nfree) >> 64]`, exactly what
+`CounterRandom.choice` picks. So game b places its food where
+`HeadlessGame(seed=seed + b, rng="counter")` would for the same moves, and
+every game is reproducible on its own whatever the batch size.
+
+Only needs `numpy` when used. `greedy_actions` is a vectorized baseline
+(toward the food, avoiding immediate death) for throughput measurements:
+
+    python batch_env.py --games 10000 --size 10x10 --steps 500
+
+"""
+
+import argparse
+import sys
+import time
+from typing import Optional, Sequence
+
+from config import COLS, ROWS, START_LEN
+from headless import max_start_len
+
+try:
+    import numpy as np
+except ImportError:  # numpy opsiyonel
+    np = None
+
+WALL, BODY = 1, 2
+_GOLDEN = 0x9E3779B97F4A7C15
+
+def splitmix64(seed: "np.ndarray", k: "np.ndarray") -> "np.ndarray":
+    """rng.splitmix64'ün vektör hâli (uint64 taşması mod 2^64)."""
+    z = seed.astype(np.uint64) + (k.astype(np.uint64) + np.uint64(1)) * np.uint64(_GOLDEN)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+class BatchEnv:
+    def __init__(self, games: int, cols: int = COLS, rows: int = ROWS,
+                 start_len: int = START_LEN, seed: int = 0):
+        if np is None:
+            raise RuntimeError("BatchEnv needs numpy (pip install numpy)")
+        if not 1 <= start_len <= max_start_len(cols):
+            raise ValueError(f"start_len must be between 1 and {max_start_len(cols)} on a board {cols} wide, got {start_len}")
+        self.games = games
+        self.cols = cols
+        self.rows = rows
+        self.cells = cols * rows
+        self.start_len = start_len
+        self.seeds = np.arange(seed, seed + games, dtype=np.uint64)
+        b, n = games, self.cells
+        self.occ = np.zeros((b, n), dtype=np.uint8)
+        self.body = np.zeros((b, n), dtype=np.int32)
+        self.head = np.zeros(b, dtype=np.int64)     # halka tamponda başın yeri
+        self.length = np.zeros(b, dtype=np.int64)
+        self.food = np.full(b, -1, dtype=np.int64)
+        self.pool = np.zeros((b, n), dtype=np.int32)   # boş hücreler, FreeCells sırasıyla
+        self.where = np.zeros((b, n), dtype=np.int32)  # hücrenin havuzdaki yeri (-1 = dolu)
+        self.nfree = np.zeros(b, dtype=np.int64)
+        self.draws = np.zeros(b, dtype=np.uint64)   # oyun başına yem sayacı (k)
+        self.alive = np.zeros(b, dtype=bool)
+        self.score = np.zeros(b, dtype=np.int64)
+        self.steps = np.zeros(b, dtype=np.int64)
+        self.cause = np.zeros(b, dtype=np.int8)
+        self._dx = np.array([1, -1, 0, 0])
+        self._dy = np.array([0, 0, 1, -1])
+        self._rows = np.arange(b)
+        self.reset()
+
+    def reset(self, mask: Optional["np.ndarray"] = None) -> None:
+        """Seçili oyunları (varsayılan: hepsi) HeadlessGame.reset gibi başlat; yem sayacı sürer."""
+        idx = self._rows if mask is None else np.flatnonzero(mask)
+        if not len(idx):
+            return
+        cx, cy = self.cols // 2, self.rows // 2
+        start = np.array([cy * self.cols + cx - i for i in range(self.start_len)], dtype=np.int32)
+        self.occ[idx] = 0
+        self.body[idx, :self.start_len] = start
+        self.occ[idx[:, None], start[None, :]] = 1
+        cells = np.arange(self.cells)
+        self.pool[idx] = cells
+        self.where[idx] = cells
+        self.nfree[idx] = self.cells
+        for c in start:  # FreeCells(board, gövde) ile aynı sırada çıkar
+            self._discard(idx, np.full(len(idx), c))
+        self.head[idx] = 0
+        self.length[idx] = self.start_len
+        self.alive[idx] = True
+        self.score[idx] = 0
+        self.steps[idx] = 0
+        self.cause[idx] = 0
+        self._spawn(idx)
+
+    # --- okuma yardımcıları ---------------------------------------------------
+
+    def head_cells(self) -> "np.ndarray":
+        return self.body[self._rows, self.head]
+
+    def tail_cells(self) -> "np.ndarray":
+        return self.body[self._rows, (self.head + self.length - 1) % self.cells]
+
+    def grids(self) -> "np.ndarray":
+        """(B, rows, cols) doluluk ızgarası (görünüm, kopya değil)."""
+        return self.occ.reshape(self.games, self.rows, self.cols)
+
+    @property
+    def won(self) -> "np.ndarray":
+        return self.length >= self.cells
+
+    # --- kurallar -------------------------------------------------------------
+
+    def _discard(self, idx: "np.ndarray", cells: "np.ndarray") -> None:
+        """FreeCells.discard: sondaki hücre boşalan yere taşınır (oyun başına bir hücre)."""
+        k = self.where[idx, cells]
+        has = k >= 0
+        idx, cells, k = idx[has], cells[has], k[has]
+        self.nfree[idx] -= 1
+        last = self.pool[idx, self.nfree[idx]]
+        self.pool[idx, k] = last
+        self.where[idx, last] = k
+        self.where[idx, cells] = -1
+
+    def _add(self, idx: "np.ndarray", cells: "np.ndarray") -> None:
+        """FreeCells.add: sona ekle."""
+        self.where[idx, cells] = self.nfree[idx]
+        self.pool[idx, self.nfree[idx]] = cells
+        self.nfree[idx] += 1
+
+    def _spawn(self, idx: "np.ndarray") -> None:
+        """idx oyunlarına yem: CounterRandom.choice gibi pool[(draw * nfree) >> 64]."""
+        n = self.nfree[idx]
+        draw = splitmix64(self.seeds[idx], self.draws[idx])
+        self.draws[idx] += np.uint64(1)
+        # 128 bitlik çarpımın üst yarısı, 32 bitlik parçalarla (nfree < 2^32, taşmasız)
+        n64 = n.astype(np.uint64)
+        lo = (draw & np.uint64(0xFFFFFFFF)) * n64
+        hi = (draw >> np.uint64(32)) * n64
+        r = ((hi + (lo >> np.uint64(32))) >> np.uint64(32)).astype(np.int64)
+        self.food[idx] = np.where(n > 0, self.pool[idx, np.minimum(r, self.cells - 1)], -1)
+
+    def step(self, actions: "np.ndarray") -> "np.ndarray":
+        """Yaşayan tüm oyunları bir adım ilerlet; bu adımda yiyenlerin maskesini döndür."""
+        cols, cap = self.cols, self.cells
+        live = np.flatnonzero(self.alive)
+        ate = np.zeros(self.games, dtype=bool)
+        if not len(live):
+            return ate
+        act = np.asarray(actions)[live]
+        head = self.body[live, self.head[live]]
+        nx = head % cols + self._dx[act]
+        ny = head // cols + self._dy[act]
+        self.steps[live] += 1
+
+        wall = (nx < 0) | (nx >= cols) | (ny < 0) | (ny >= self.rows)
+        self.alive[live[wall]] = False
+        self.cause[live[wall]] = WALL
+        live, nx, ny = live[~wall], nx[~wall], ny[~wall]
+
+        ni = ny * cols + nx
+        eat = ni == self.food[live]
+        tail_slot = (self.head[live] + self.length[live] - 1) % cap
+        tail = self.body[live, tail_slot]
+        hit = (self.occ[live, ni] > 0) & ((ni != tail) | eat)
+        self.alive[live[hit]] = False
+        self.cause[live[hit]] = BODY
+        live, ni, eat, tail = live[~hit], ni[~hit], eat[~hit], tail[~hit]
+
+        # Önce kuyruk (yemeyenler), sonra baş: halka dolu tahtada da taşmaz
+        no_eat = ~eat
+        self.occ[live[no_eat], tail[no_eat]] -= 1
+        self.length[live[no_eat]] -= 1
+        self.head[live] = (self.head[live] - 1) % cap
+        self.body[live, self.head[live]] = ni
+        self.occ[live, ni] += 1
+        self.length[live] += 1
+
+        # Havuz step_once sırasıyla: baş çıkar, sonra boşalan kuyruk eklenir
+        self._discard(live, ni)
+        moved = live[no_eat]
+        vacated = self.occ[moved, tail[no_eat]] == 0
+        self._add(moved[vacated], tail[no_eat][vacated])
+
+        eaters = live[eat]
+        if len(eaters):
+            self.score[eaters] += 1
+            ate[eaters] = True
+            self._spawn(eaters)
+            # Tahtayı dolduran oyun biter (HeadlessGame.logic_tick gibi)
+            full = eaters[self.length[eaters] >= cap]
+            self.alive[full] = False
+        return ate
+
+def greedy_actions(env: BatchEnv) -> "np.ndarray":
+    """Vektör taban çizgisi: ölümcül olmayan yönlerden yeme en yakını (yoksa 0)."""
+    cols, rows = env.cols, env.rows
+    head = env.head_cells()
+    tail = env.tail_cells()
+    hx, hy = head % cols, head // cols
+    fx, fy = env.food % cols, env.food // cols
+    nx = hx[:, None] + env._dx[None, :]
+    ny = hy[:, None] + env._dy[None, :]
+    inside = (nx >= 0) & (nx < cols) & (ny >= 0) & (ny < rows)
+    ni = np.where(inside, ny * cols + nx, 0)
+    occupied = env.occ[env._rows[:, None], ni] > 0
+    eat = ni == env.food[:, None]
+    ok = inside & (~occupied | ((ni == tail[:, None]) & ~eat))
+    dist = np.abs(nx - fx[:, None]) + np.abs(ny - fy[:, None])
+    dist = np.where(ok, dist, cols + rows + 1)
+    return np.argmin(dist, axis=1)
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from tournament import parse_size
+
+    ap = argparse.ArgumentParser(description="Step many games in lockstep with NumPy (greedy baseline).")
+    ap.add_argument("--games", type=int, default=10000)
+    ap.add_argument("--size", type=parse_size, default=(COLS, ROWS))
+    ap.add_argument("--steps", type=int, default=500)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    env = BatchEnv(args.games, *args.size, seed=args.seed)
+    t0 = time.perf_counter()
+    moves = 0
+    for _ in range(args.steps):
+        if not env.alive.any():
+            break
+        moves += int(env.alive.sum())
+        env.step(greedy_actions(env))
+    dt = time.perf_counter() - t0
+    print(f"{moves} game-steps in {dt:.2f}s ({moves / dt:,.0f} steps/s)  "
+          f"mean score {env.score.mean():.1f}  alive {int(env.alive.sum())}  "
+          f"wall {int((env.cause == WALL).sum())}  body {int((env.cause == BODY).sum())}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Snake AI — Hot Path Benchmarks
+
+Times the per-move hot paths on canned, reproducible board states:
+- sizes 10x10, 20x20, 50x50
+- fills "early" (start length), "mid" (50%), "late" (80%), "full" (3 empty)
+The snake is laid out as a serpentine (row by row, alternating direction)
+from the top-left, head at the end, and food is drawn from the free cells
+with a fixed seed, so every run measures the same positions.
+
+Benchmarks: `search.bfs_path` (head->food), `simulate.safe_neighbors`,
+`simulate.simulate_path_and_check_safety` (on that BFS path),
+`physics.spawn_food` and the full `ai.HeuristicPolicy.decide` (key "choose_move").
+
+    python bench.py --save bench_baseline.json        # baseline kaydet
+    python bench.py --compare bench_baseline.json     # karşılaştır (gerilemede çıkış kodu 1)
+
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from typing import Tuple, List, Dict, Any, Callable, Optional, Sequence
+
+from ai import HeuristicPolicy
+from config import START_LEN
+from headless import HeadlessGame
+from physics import spawn_food
+from regions import Regions
+import search
+from search import bfs_path
+from simulate import safe_neighbors, simulate_path_and_check_safety
+from state import SnakeBody, FreeCells
+
+Pos = Tuple[int, int]
+
+SIZES = ((10, 10), (20, 20), (50, 50))
+FILLS = (("early", 0.0), ("mid", 0.5), ("late", 0.8), ("full", None))
+
+def serpentine(cols: int, rows: int) -> List[Pos]:
+    cells: List[Pos] = []
+    for y in range(rows):
+        xs = range(cols) if y % 2 == 0 else range(cols - 1, -1, -1)
+        cells.extend((x, y) for x in xs)
+    return cells
+
+def make_state(cols: int, rows: int, fill: Optional[float], seed: int = 0) -> HeadlessGame:
+    """Sabit bir pozisyon: serpantin gövde (kuyruk sol üstte), tohumlu yem."""
+    game = HeadlessGame(cols, rows, seed=seed, policy=HeuristicPolicy())
+    total = cols * rows
+    length = total - 3 if fill is None else max(START_LEN, int(total * fill))
+    body = serpentine(cols, rows)[:length]
+    body.reverse()  # baş önce
+    game.snake = SnakeBody(game.board, body)
+    game.free = FreeCells(game.board, game.snake.indices())
+    game.regions = Regions(game.snake)
+    empty = [i for i in range(total) if not game.snake.occ[i]]
+    game.food = game.board.pos(random.Random(seed).choice(empty))
+    game.policy.reset(game)
+    return game
+
+def fresh_policy(game: HeadlessGame) -> None:
+    """Politikayı oyun başındaki hâline döndür (endgame tablosu reset'te korunur; o da silinir)."""
+    game.policy.reset(game)
+    endgame = getattr(game.policy, "endgame", None)
+    if endgame is not None:
+        endgame.clear()
+
+def _time(fn: Callable[[], Any], before: Optional[Callable[[], None]] = None,
+          min_time: float = 0.2, max_calls: int = 2000) -> Dict[str, float]:
+    fn()  # ısınma (önbellekler, lru tabloları)
+    samples: List[float] = []
+    spent = 0.0
+    while spent < min_time and len(samples) < max_calls:
+        if before is not None:
+            before()
+        t0 = time.perf_counter()
+        fn()
+        dt = time.perf_counter() - t0
+        samples.append(dt)
+        spent += dt
+    samples.sort()
+    return {"median_us": samples[len(samples) // 2] * 1e6, "min_us": samples[0] * 1e6, "calls": len(samples)}
+
+def run_benchmarks(sizes: Sequence[Tuple[int, int]] = SIZES, only: Optional[str] = None,
+                   min_time: float = 0.2) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for cols, rows in sizes:
+        for fill_name, fill in FILLS:
+            # Her ölçüm kendi oyununu alır: biri gövdeyi ya da önbellekleri değiştirirse diğerini etkilemesin
+            g_bfs, g_safe, g_spawn, g_decide, g_path = (make_state(cols, rows, fill) for _ in range(5))
+            head, food = g_bfs.snake[0], g_bfs.food
+            path = bfs_path(head, food, set(g_bfs.snake), g_bfs.board)
+            cases: Dict[str, Tuple[Callable[[], Any], Optional[Callable[[], None]]]] = {
+                "bfs_path": (lambda: bfs_path(head, food, set(g_bfs.snake), g_bfs.board), None),
+                "safe_neighbors": (lambda: safe_neighbors(g_safe), None),
+                "spawn_food": (lambda: spawn_food(g_spawn.snake, g_spawn.rng, g_spawn.board, g_spawn.free), None),
+                # decide sayaçları ve çözücü tablosunu değiştirir; her çağrı aynı işi ölçsün
+                "choose_move": (lambda: g_decide.policy.decide(g_decide), lambda: fresh_policy(g_decide)),
+            }
+            if path is not None:
+                cases["path_safety"] = (lambda: simulate_path_and_check_safety(g_path, path), None)
+            for name, (fn, before) in cases.items():
+                key = f"{name}/{cols}x{rows}/{fill_name}"
+                if only and only not in key:
+                    continue
+                results[key] = _time(fn, before, min_time)
+    return results
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float, metric: str = "min_us") -> List[str]:
+    """Baseline'a göre `threshold` katından yavaş olan anahtarlar."""
+    regressions: List[str] = []
+    for key, res in results.items():
+        base = baseline.get(key)
+        if base is None:
+            print(f"{key:<36} {res[metric]:10.1f}us   (new)")
+            continue
+        ratio = res[metric] / max(base[metric], 1e-9)
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(f"{key:<36} {res[metric]:10.1f}us  base {base[metric]:10.1f}us  x{ratio:5.2f}{flag}")
+        if ratio > threshold:
+            regressions.append(key)
+    return regressions
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from tournament import parse_size
+
+    ap = argparse.ArgumentParser(description="Benchmark the Snake AI hot paths on canned states.")
+    ap.add_argument("--sizes", type=parse_size, nargs="+", default=list(SIZES))
+    ap.add_argument("--only", default=None, help="run keys containing this text, e.g. choose_move or 50x50")
+    ap.add_argument("--min-time", type=float, default=0.2, help="seconds per benchmark")
+    ap.add_argument("--backend", choices=search.BACKENDS, default="python", help="search backend")
+    ap.add_argument("--save", default=None, help="write results as a JSON baseline")
+    ap.add_argument("--compare", default=None, help="baseline JSON to compare against")
+    ap.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio counted as regression")
+    ap.add_argument("--metric", choices=("min_us", "median_us"), default="min_us",
+                    help="statistic compared against the baseline (min is the least noisy)")
+    args = ap.parse_args(argv)
+
+    search.set_backend(args.backend)
+    results = run_benchmarks(args.sizes, args.only, args.min_time)
+
+    code = 0
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold, args.metric)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over x{args.threshold}")
+            code = 1
+    else:
+        for key, res in results.items():
+            print(f"{key:<36} median {res['median_us']:10.1f}us  min {res['min_us']:10.1f}us  ({res['calls']} calls)")
+
+    if args.save:
+        meta = {"python": platform.python_version(), "machine": platform.machine(), "backend": args.backend,
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+    return code
+
+if __name__ == "__main__":
+    sys.exit(main())
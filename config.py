@@ -7,6 +7,9 @@ MARGIN     = 2
 START_LEN  = 4
 BASE_FPS   = 14
 LOGIC_TPS  = 12
+ASYNC_AI   = False         # True: kararlar arka plan iş parçacığında (planner.Planner)
+RECORD_PATH = None         # ör. "games.snkr": SnakeAI her oyunu bu dosyaya kaydeder
+POLICY     = "heuristic"   # policy.REGISTRY adı: "heuristic" / "hamilton" / "lookahead"
 
 BG_COLOR   = (16, 18, 20)
 GRID_COLOR = (28, 30, 33)
@@ -0,0 +1,300 @@
+"""
+Snake AI — Exact Endgame Solver
+
+With at most `max_empty` free cells left, `Endgame.score_moves` computes for
+every legal move the exact probability of filling the board under best play,
+averaging over every possible food placement (no sampling):
+- a stage is the walk to the current food, at most `horizon` moves (default:
+  one per cell — enough to let the whole body pass once — up to the
+  recursion cap below; values are exact within it); moving onto the
+  food starts a chance node over all free cells for the next food,
+- positions are memoized in an LRU table keyed on the Zobrist hash of the
+  ordered body (`zobrist.zobrist_keys`; head cell, occupancy and tail order
+  are all in it — occupancy alone would not tell where the tail frees up)
+  plus the food cell. An entry stores the moves left when it was solved;
+  since more moves never hurt, 0 is reused with fewer moves and 1 with more,
+- a position already on the search stack counts 0 (repeating a position
+  cannot help); values that depended on such a cut are not stored. The
+  current position itself is not put on the stack, so every root move gets
+  its exact value, also along lines that pass through the current position
+  again,
+- reachability/parity pruning: the head reaches a neighbour n of the food no
+  earlier than max(|head - n|, time until n vacates), and only at times of
+  the parity of |head - n| on the grid; a stage whose bound exceeds the moves
+  left is lost,
+- a stage (and the root) stops at the first winning move (value 1).
+Search is in place on a `SnakeBody` copy, under `budget_nodes` stage
+expansions per decision, so the result depends only on the position and the
+table; `budget_ms` adds an optional wall-clock cap (interactive play; off by
+default since it makes games timing-dependent). `<= 0` disables either. Over
+budget `score_moves` returns an empty dict and the caller keeps its
+heuristic. The table survives across ticks, so the following ticks of a
+solved endgame are lookups. While chasing the same food the root keeps
+counting its stage down across ticks (one move less per tick), so a winning
+plan has to be carried out rather than postponed.
+
+The stage walk is recursive, one frame per move. The default horizon is
+capped so that `(max_empty + 1) * (horizon + 1)` frames stay within
+`MAX_DEPTH`, below Python's default recursion limit; the process-wide limit
+is never changed.
+
+`brute_force` solves the same game without hashing or pruning; on tiny
+boards the solver is cross-checked against it move by move:
+
+    python endgame.py --sizes 3x3 2x4 3x4 4x4 --games 30
+
+"""
+
+import argparse
+import sys
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Tuple, List, Dict, Optional, Sequence
+
+from grid import Board
+from state import SnakeBody
+from zobrist import Timeout, zobrist_keys, body_hash, advance, undo, legal_moves
+
+Pos = Tuple[int, int]
+
+NO_CUT = 1 << 30  # alt ağaçta yığın kesmesi yok
+MAX_DEPTH = 800  # arama yığın derinliği üst sınırı (varsayılan özyineleme limiti 1000)
+
+class Endgame:
+    def __init__(self, board: Board, max_empty: int = 8, budget_ms: float = 0.0,
+                 horizon: Optional[int] = None, table_size: int = 1 << 18, budget_nodes: int = 5000):
+        self.board = board
+        self.cols = board.cols
+        self.cells = board.cells
+        self.seg, self.food_key = zobrist_keys(board.cols, board.rows)
+        self.max_empty = max_empty
+        self.budget_ms = budget_ms
+        self.budget_nodes = budget_nodes
+        limit = MAX_DEPTH // (max_empty + 1) - 1
+        if horizon is None:
+            horizon = min(board.cells, limit)
+        elif horizon > limit:
+            raise ValueError(f"horizon {horizon} too deep for max_empty={max_empty} (at most {limit})")
+        self.horizon = horizon
+        self.table_size = table_size
+        self.table: "OrderedDict[int, Tuple[float, int]]" = OrderedDict()  # anahtar -> (değer, kalan hamle)
+        self.nodes = 0
+        self._stack: Dict[int, int] = {}  # yığındaki konum -> derinlik
+        self._deadline = 0.0
+        self._limit: float = 0  # bu karardaki düğüm sınırı (self.nodes cinsinden)
+        self.plan: Optional[Tuple[int, int, int]] = None  # (yem, uzunluk, kalan hamle)
+
+    def clear(self) -> None:
+        self.table.clear()
+        self.nodes = 0
+        self.plan = None
+
+    # --- tablo -------------------------------------------------------------------
+
+    def _lookup(self, key: int, left: int) -> Optional[float]:
+        entry = self.table.get(key)
+        if entry is None:
+            return None
+        value, solved = entry
+        # Daha çok hamle asla zarar vermez: değer kalan hamleyle azalmaz
+        if solved == left or (value >= 1.0 and left >= solved) or (value <= 0.0 and left <= solved):
+            self.table.move_to_end(key)
+            return value
+        return None
+
+    def _store(self, key: int, value: float, left: int) -> None:
+        table = self.table
+        table[key] = (value, left)
+        table.move_to_end(key)
+        if len(table) > self.table_size:
+            table.popitem(last=False)
+
+    # --- arama ---------------------------------------------------------------------
+
+    def _moves(self, snake: SnakeBody, food: int) -> List[int]:
+        """Yasal hamleler, yeme Manhattan uzaklığına göre (kazanç erken bulunsun)."""
+        cols = self.cols
+        fx, fy = food % cols, food // cols
+        moves = legal_moves(snake, food)
+        moves.sort(key=lambda j: abs(j % cols - fx) + abs(j // cols - fy))
+        return moves
+
+    def _reach_bound(self, snake: SnakeBody, food: int) -> int:
+        """Yeme varış için alt sınır (hamle): komşu boşalma zamanı + ızgara paritesi."""
+        head, cols = snake.head_idx, self.cols
+        hx, hy = head % cols, head // cols
+        best = NO_CUT
+        for n in snake.adj[food]:
+            if n == head:
+                return 1
+            d = abs(n % cols - hx) + abs(n // cols - hy)
+            t = max(d, snake.vacates_in(n))
+            if (t - d) & 1:
+                t += 1
+            best = min(best, t + 1)
+        return best
+
+    def _stage(self, snake: SnakeBody, h: int, food: int, left: int, depth: int) -> Tuple[float, int]:
+        """(kazanma olasılığı, en sığ yığın kesmesi) — yem `food`da, `left` hamle kaldı."""
+        self.nodes += 1
+        if self.nodes > self._limit or time.perf_counter() > self._deadline:
+            raise Timeout
+        key = h ^ self.food_key[food]
+        cached = self._lookup(key, left)
+        if cached is not None:
+            return cached, NO_CUT
+        cut = self._stack.get(key)
+        if cut is not None:
+            return 0.0, cut
+        if self._reach_bound(snake, food) > left:
+            self._store(key, 0.0, left)
+            return 0.0, NO_CUT
+
+        self._stack[key] = depth
+        best, low = 0.0, NO_CUT
+        try:
+            for j in self._moves(snake, food):
+                grow = j == food
+                h2, t = advance(self.seg, snake, j, grow, h)
+                try:
+                    if grow:
+                        value, cut = self._after_eat(snake, h2, depth + 1)
+                    else:
+                        value, cut = self._stage(snake, h2, food, left - 1, depth + 1)
+                finally:
+                    undo(snake, t)
+                low = min(low, cut)
+                if value > best:
+                    best = value
+                    if best >= 1.0:
+                        break
+        finally:
+            del self._stack[key]
+        if low >= depth:
+            self._store(key, best, left)
+        return best, low
+
+    def _after_eat(self, snake: SnakeBody, h: int, depth: int) -> Tuple[float, int]:
+        """Yem yendi: tahta doluysa kazanıldı, değilse tüm yem yerleşimlerinin ortalaması."""
+        if len(snake) >= self.cells:
+            return 1.0, NO_CUT
+        occ = snake.occ
+        free = [i for i in range(self.cells) if not occ[i]]
+        total, low = 0.0, NO_CUT
+        for f in free:
+            value, cut = self._stage(snake, h, f, self.horizon, depth)
+            total += value
+            low = min(low, cut)
+        return total / len(free), low
+
+    def score_moves(self, game) -> Dict[Pos, float]:
+        """Yasal hamle -> kazanma olasılığı (ilk kazanan hamlede durur); uygun değilse ya da bütçe aşılırsa boş sözlük."""
+        snake = game.snake
+        if game.food is None or len(snake) < 2 or self.cells - len(snake) > self.max_empty:
+            return {}
+        snake = snake.copy()
+        food = snake.index(game.food)
+        h = body_hash(snake)
+        budget = self.budget_ms / 1000.0 if self.budget_ms > 0 else float("inf")
+        self._deadline = time.perf_counter() + budget
+        self._limit = self.nodes + self.budget_nodes if self.budget_nodes > 0 else float("inf")
+
+        # Aynı yemin peşindeyken bütçe her tick bir azalır; yoksa "her an kazanabilirim"
+        # diyip yemi hiç yemeden dolaşabilir
+        plan = self.plan
+        if plan is not None and plan[0] == food and plan[1] == len(snake):
+            left = max(1, plan[2] - 1)
+        else:
+            left = self.horizon
+        self.plan = None
+
+        # Kök yığına konmaz: kökten geçen bir yol da hamlenin kendi değerine sayılır
+        self._stack = {}
+        scores: Dict[Pos, float] = {}
+        try:
+            for j in self._moves(snake, food):
+                grow = j == food
+                h2, t = advance(self.seg, snake, j, grow, h)
+                try:
+                    if grow:
+                        value, _ = self._after_eat(snake, h2, 1)
+                    else:
+                        value, _ = self._stage(snake, h2, food, left - 1, 1)
+                finally:
+                    undo(snake, t)
+                scores[snake.cell_pos[j]] = value
+                if value >= 1.0:
+                    break  # kazanan hamle bulundu; kalanlar gerekmez
+        except Timeout:
+            return {}
+        finally:
+            self._stack = {}
+        self.plan = (food, len(snake), left)
+        return scores
+
+def brute_force(snake: SnakeBody, food: int, horizon: int) -> Dict[int, float]:
+    """Çapraz kontrol için budamasız, hash'siz tam çözüm: yasal hamle -> kazanma olasılığı (küçük tahtalar)."""
+    adj, cells = snake.adj, len(snake.occ)
+
+    @lru_cache(maxsize=None)
+    def value(body: Tuple[int, ...], food: int, left: int) -> float:
+        if left <= 0:
+            return 0.0
+        return max((move(body, food, j, left) for j in legal(body, food)), default=0.0)
+
+    def legal(body: Tuple[int, ...], food: int) -> List[int]:
+        tail = body[-1]
+        return [j for j in adj[body[0]] if j not in body or (j == tail and j != food and len(body) > 1)]
+
+    def move(body: Tuple[int, ...], food: int, j: int, left: int) -> float:
+        if j != food:
+            return value((j,) + body[:-1], food, left - 1)
+        body = (j,) + body
+        if len(body) >= cells:
+            return 1.0
+        free = [f for f in range(cells) if f not in body]
+        return sum(value(body, f, horizon) for f in free) / len(free)
+
+    body = tuple(snake.indices())
+    return {j: move(body, food, j, horizon) for j in legal(body, food)}
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from ai import HeuristicPolicy
+    from headless import HeadlessGame
+    from tournament import parse_size
+
+    ap = argparse.ArgumentParser(description="Cross-check the endgame solver against brute force on tiny boards.")
+    ap.add_argument("--sizes", type=parse_size, nargs="+", default=[(3, 3), (2, 4), (3, 4), (4, 3), (4, 4)])
+    ap.add_argument("--games", type=int, default=30, help="seeded games per size")
+    ap.add_argument("--seed", type=int, default=0, help="first seed")
+    ap.add_argument("--max-empty", type=int, default=4)
+    args = ap.parse_args(argv)
+
+    checked = bad = 0
+    for cols, rows in args.sizes:
+        solver = None
+        for seed in range(args.seed, args.seed + args.games):
+            # Oyunu sezgisel politika oynar; çözücü yalnızca her uygun konumda sorgulanır
+            game = HeadlessGame(cols, rows, seed=seed, start_len=2,
+                                policy=HeuristicPolicy(endgame_empty=0))
+            if solver is None:
+                solver = Endgame(game.board, args.max_empty, budget_nodes=0)  # tablo oyunlar arası paylaşılır
+            while game.alive and not game.won and game.steps < 4 * game.board.cells ** 2:
+                solver.plan = None
+                scores = solver.score_moves(game)
+                if scores:
+                    truth = brute_force(game.snake, game.snake.index(game.food), solver.horizon)
+                    for pos, value in scores.items():
+                        checked += 1
+                        want = truth[game.board.index(pos)]
+                        if abs(value - want) > 1e-9:
+                            bad += 1
+                            print(f"{cols}x{rows} seed {seed} step {game.steps} move {pos}: "
+                                  f"solver {value:.6f}, brute force {want:.6f}")
+                game.logic_tick()
+    print(f"{checked} move values checked, {bad} mismatches")
+    return 1 if bad else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,47 +1,92 @@
 import sys
-import random
-from collections import deque
-from typing import Tuple, Deque
 
 import pygame as pg
 
-from config import START_LEN, BASE_FPS, LOGIC_TPS, BG_COLOR, COLS, ROWS
-from heuristics import manhattan
-from physics import spawn_food, step_once
-from ai import choose_move
-import ui
+from typing import Optional, Tuple
 
-Pos = Tuple[int, int]
+from config import BASE_FPS, LOGIC_TPS, COLS, ROWS, POLICY, ASYNC_AI, RECORD_PATH
+from grid import get_board
+from headless import HeadlessGame
+import instrument
+from planner import Planner
+import recording
+import ui
 
-class SnakeAI:
-    def __init__(self):
-        self.screen, self.clock, self.font, self.bigfont, self.sprites = ui.init_ui()
-        random.seed(0xBEEF)
-        self.cols = COLS
-        self.rows = ROWS
-        self.reset()
+class SnakeAI(HeadlessGame):
+    def __init__(self, cols: int = COLS, rows: int = ROWS, policy=POLICY, async_ai: bool = ASYNC_AI,
+                 record: Optional[str] = RECORD_PATH):
+        board = get_board(cols, rows)
+        self.screen, self.clock, self.font, self.bigfont, self.sprites = ui.init_ui(board)
+        self.renderer = ui.Renderer(self.screen, self.sprites, self.font, self.bigfont, board)
+        self.planner: Optional[Planner] = None
+        self.record_path = record  # her oyun bu dosyanın sonuna eklenir
+        self.games = 0
+        super().__init__(cols, rows, seed=0xBEEF, policy=policy)
+        if async_ai:
+            # Kararlar arka planda önceden hesaplanır; çizim döngüsü yalnızca tüketir
+            self.planner = Planner(self.policy)
+            self.planner.restart(self)
 
     def reset(self):
-        cx, cy = self.cols // 2, self.rows // 2
-        self.snake: Deque[Pos] = deque([(cx - i, cy) for i in range(START_LEN)])
-        self.dir = (1, 0)
-        self.alive = True
-        self.paused = False
-        self.score = 0
-        self.hiscore = getattr(self, "hiscore", 0)
-        self.food = spawn_food(self.snake)
+        self.save_recording()
+        if self.planner is not None:
+            with self.planner.lock:  # politika sıfırlanırken işçi karar vermesin
+                super().reset()
+            self.planner.restart(self)
+        else:
+            super().reset()
+        self.renderer.invalidate()
+        if self.record_path:
+            # Yalnızca ilk oyun tohumdan başlar; sonrakiler RNG'yi sürdürür
+            self.recorder = recording.Recorder(self, 0xBEEF if self.games == 0 else None)
+        self.games += 1
         self.logic_accum = 0.0
-        self.status = "init"
         
         # --- YENİ EKLENEN SAYAÇ ---
         self.game_time = 0.0  # Saniye cinsinden geçen süre
 
-        # Anti-loop / stuck state
-        self.last_score = 0
-        self.last_food = self.food
-        self.last_dist = manhattan(self.snake[0], self.food)
-        self.stuck_counter = 0
-        self.jitter_phase = 0
+    def snapshot(self):
+        if self.planner is None:
+            return super().snapshot()
+        # İşçi karar verirken sayaçlar okunmasın. Not: politika sayaçları
+        # kuyruktaki planlı hamleler kadar ileride olabilir.
+        with self.planner.lock:
+            return super().snapshot()
+
+    def restore(self, snap):
+        if self.planner is not None:
+            with self.planner.lock:
+                super().restore(snap)
+            self.planner.restart(self)
+        else:
+            super().restore(snap)
+        self.renderer.invalidate()
+
+    def next_move(self) -> Optional[Tuple[int, int]]:
+        if self.planner is None:
+            return super().next_move()
+        planned = self.planner.next_move()
+        if planned is None:
+            return None
+        move, self.status = planned
+        return move
+
+    def logic_tick(self):
+        score = self.score
+        super().logic_tick()
+        if self.planner is not None and self.score != score:
+            self.planner.restart(self)  # yeni yem: plan yeniden kurulur
+        if not self.alive:
+            self.save_recording()
+
+    def save_recording(self):
+        if self.recorder is not None:
+            recording.append(self.record_path, self.recorder.finish(self))
+            self.recorder = None
+
+    def quit(self):
+        self.save_recording()
+        pg.quit(); sys.exit(0)
 
     def handle_input(self, event):
         if event.type == pg.KEYDOWN:
@@ -49,28 +94,20 @@ class SnakeAI:
                 self.paused = not self.paused
             elif event.key == pg.K_r:
                 self.reset()
+            elif event.key == pg.K_i:
+                # Karar süresi ölçümünü aç/kapat (HUD'da gösterilir)
+                if instrument.ACTIVE is None:
+                    instrument.enable()
+                else:
+                    instrument.disable()
             elif event.key == pg.K_ESCAPE:
-                pg.quit(); sys.exit(0)
-
-    def logic_tick(self):
-        if not self.alive or self.paused:
-            return
-        
-        # Eğer harita dolduysa (Mükemmel oyun), oyunu durdur (alive=False yapabiliriz veya özel statü verebiliriz)
-        # Fizik motorunda çarpışma kontrolü var ama 'Win' durumu için buraya ekleyebilirsin.
-        if len(self.snake) >= self.cols * self.rows:
-             self.alive = False
-             self.status = "MAP CLEARED!"
-             return
-
-        nxt = choose_move(self)
-        step_once(self, nxt)
+                self.quit()
 
     def run(self):
         while True:
             for event in pg.event.get():
                 if event.type == pg.QUIT:
-                    pg.quit(); sys.exit(0)
+                    self.quit()
                 self.handle_input(event)
 
             # Geçen gerçek zamanı (milisaniye) al
@@ -88,23 +125,10 @@ class SnakeAI:
                 self.logic_tick()
                 self.logic_accum -= step_dt
 
-            # ---- ÇİZİM SIRASI ----
-            self.screen.fill(BG_COLOR)
-            ui.draw_tiles(self.screen, self.sprites["floor"])  
-            ui.draw_food(self.screen, self.food, self.sprites["food"])  
-            ui.draw_snake(self.screen, self.snake, self.sprites)  
-            
+            # ---- ÇİZİM: yalnızca değişen hücreler (ui.Renderer) ----
             self.hiscore = max(self.hiscore, self.score)
-            
-            # HUD Çizimi: Artık self.game_time'ı da gönderiyoruz
-            ui.draw_hud(self.screen, self.font, self.score, self.hiscore, self.status, self.game_time)
-            
-            if self.paused and self.alive:
-                ui.draw_pause(self.screen, self.bigfont)
-            if not self.alive:
-                ui.draw_gameover(self.screen, self.bigfont, self.font)
-
-            pg.display.flip()
+            perf = instrument.ACTIVE.hud_text() if instrument.ACTIVE is not None else ""
+            pg.display.update(self.renderer.draw(self, self.game_time, perf))
             self.clock.tick(BASE_FPS)
 
 if __name__ == "__main__":
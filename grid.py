@@ -2,28 +2,84 @@
 Snake AI — Grid Primitives (updated 2025-11-05 12:18)
 
 This module centralizes the grid geometry:
-- `in_bounds((x,y))` enforces 0≤x<COLS and 0≤y<ROWS using `config`.
-- `neighbors((x,y))` returns 4-neighborhood valid cells.
+- `Board(cols, rows)` carries the board size at runtime; games on different
+  sizes can run side by side in one process. `get_board()` caches one
+  instance (and its tables) per size; `DEFAULT_BOARD` is `config.COLS/ROWS`.
+- `in_bounds((x,y), board)` enforces 0≤x<cols and 0≤y<rows.
+- `neighbors((x,y), board)` returns 4-neighborhood valid cells.
 All other modules rely on these to stay correct for any m×n dimensions.
+Pixel geometry (`cell_rect`) lives in `ui` so this module stays pygame-free.
+
+Flat indexing: cell (x,y) is index `y*cols + x`. `neighbor_table(cols, rows)`
+and `cell_positions(cols, rows)` are precomputed once per board size, so hot
+loops (BFS, simulation) look neighbors up instead of building and filtering
+candidate tuples. Neighbor order is always (x+1,y),(x-1,y),(x,y+1),(x,y-1).
 
 """
 
+from functools import lru_cache
 from typing import Tuple, List
-from pygame import Rect
-import pygame as pg
 
-from config import CELL, COLS, ROWS
+from config import COLS, ROWS
 
 Pos = Tuple[int, int]
 
-def cell_rect(x: int, y: int) -> Rect:
-    return pg.Rect(x * CELL, y * CELL, CELL, CELL)
+@lru_cache(maxsize=None)
+def neighbor_table(cols: int = COLS, rows: int = ROWS) -> Tuple[Tuple[int, ...], ...]:
+    """Hücre indeksi -> komşu indeksleri (tahta boyutu başına bir kez)."""
+    table = []
+    for i in range(cols * rows):
+        x, y = i % cols, i // cols
+        cand = [(x+1,y),(x-1,y),(x,y+1),(x,y-1)]
+        table.append(tuple(ny * cols + nx for nx, ny in cand if 0 <= nx < cols and 0 <= ny < rows))
+    return tuple(table)
+
+@lru_cache(maxsize=None)
+def cell_positions(cols: int = COLS, rows: int = ROWS) -> Tuple[Pos, ...]:
+    """Hücre indeksi -> (x,y); her seferinde tuple üretmemek için."""
+    return tuple((i % cols, i // cols) for i in range(cols * rows))
+
+class Board:
+    """Tahta boyutu ve o boyuta ait önceden hesaplanmış tablolar (değişmez)."""
+    __slots__ = ("cols", "rows", "cells", "nbrs", "positions")
+
+    def __init__(self, cols: int, rows: int):
+        if cols < 1 or rows < 1:
+            raise ValueError(f"board must be at least 1x1, got {cols}x{rows}")
+        self.cols = cols
+        self.rows = rows
+        self.cells = cols * rows
+        self.nbrs = neighbor_table(cols, rows)
+        self.positions = cell_positions(cols, rows)
+
+    def __repr__(self) -> str:
+        return f"Board({self.cols}, {self.rows})"
+
+    def in_bounds(self, pos: Pos) -> bool:
+        x, y = pos
+        return 0 <= x < self.cols and 0 <= y < self.rows
+
+    def index(self, pos: Pos) -> int:
+        return pos[1] * self.cols + pos[0]
+
+    def pos(self, i: int) -> Pos:
+        return self.positions[i]
+
+    def neighbors(self, pos: Pos) -> List[Pos]:
+        if self.in_bounds(pos):
+            return [self.positions[j] for j in self.nbrs[pos[1] * self.cols + pos[0]]]
+        x, y = pos
+        cand = [(x+1,y),(x-1,y),(x,y+1),(x,y-1)]
+        return [p for p in cand if self.in_bounds(p)]
+
+@lru_cache(maxsize=None)
+def get_board(cols: int = COLS, rows: int = ROWS) -> Board:
+    return Board(cols, rows)
+
+DEFAULT_BOARD = get_board(COLS, ROWS)
 
-def in_bounds(pos: Pos) -> bool:
-    x, y = pos
-    return 0 <= x < COLS and 0 <= y < ROWS
+def in_bounds(pos: Pos, board: Board = DEFAULT_BOARD) -> bool:
+    return board.in_bounds(pos)
 
-def neighbors(pos: Pos) -> List[Pos]:
-    x, y = pos
-    cand = [(x+1,y),(x-1,y),(x,y+1),(x,y-1)]
-    return [p for p in cand if in_bounds(p)]
+def neighbors(pos: Pos, board: Board = DEFAULT_BOARD) -> List[Pos]:
+    return board.neighbors(pos)
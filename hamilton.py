@@ -0,0 +1,128 @@
+"""
+Snake AI — Hamiltonian Cycle Policy
+
+Alternative to the heuristic stack in `ai.HeuristicPolicy`. A Hamiltonian cycle
+(every cell visited once) is built once per board size and cached. The
+snake follows it and takes shortcuts toward the food using cycle-order
+distances, so each decision is O(1) and completion is guaranteed.
+
+Invariant: walking the body from tail to head, the cycle positions strictly
+increase (mod N) and span less than N cells. So every cell ahead of the
+head, up to the tail, is free. A move to neighbor `n` keeps the invariant if
+`d(head, n) < d(head, tail)`. The policy also never skips past the food
+(`d(head, n) <= d(head, food)`). Stepping onto the tail cell is allowed
+when it is the plain cycle step, like in the game rules.
+
+A grid has a Hamiltonian cycle only if both sides are >= 2 and the cell
+count is even. On other boards, and until the starting body satisfies the
+invariant, the policy delegates to an owned `HeuristicPolicy`.
+
+`HamiltonPolicy` is registered as "hamilton"; config: `shortcuts=False`
+follows the plain cycle (slowest, simplest). Any other option configures the
+fallback `HeuristicPolicy` (e.g. `endgame_nodes=0`).
+
+"""
+
+from functools import lru_cache
+from typing import Tuple, Optional, List
+
+from ai import HeuristicPolicy
+from policy import register
+
+Pos = Tuple[int, int]
+
+@lru_cache(maxsize=None)
+def hamiltonian_cycle(cols: int, rows: int) -> Optional[Tuple[int, ...]]:
+    """Döngü sırasıyla hücre indeksleri; döngü yoksa None."""
+    if cols < 2 or rows < 2 or (cols * rows) % 2:
+        return None
+    if rows % 2:
+        # Satır sayısı tekse transpoz tahtada kur, sonra geri çevir
+        return tuple((i % rows) * cols + i // rows for i in hamiltonian_cycle(rows, cols))
+    cells: List[Pos] = [(x, 0) for x in range(cols)]          # üst satır soldan sağa
+    for y in range(1, rows):                                   # 1..cols-1 sütunlarında serpantin
+        xs = range(cols - 1, 0, -1) if y % 2 else range(1, cols)
+        cells.extend((x, y) for x in xs)
+    cells.extend((0, y) for y in range(rows - 1, 0, -1))       # 0. sütundan yukarı dönüş
+    return tuple(y * cols + x for x, y in cells)
+
+@lru_cache(maxsize=None)
+def cycle_order(cols: int, rows: int) -> Optional[Tuple[int, ...]]:
+    """Hücre indeksi -> döngüdeki sırası."""
+    cycle = hamiltonian_cycle(cols, rows)
+    if cycle is None:
+        return None
+    order = [0] * len(cycle)
+    for k, i in enumerate(cycle):
+        order[i] = k
+    return tuple(order)
+
+def _orientation(game, order: Tuple[int, ...]) -> int:
+    """Gövde döngüde ileri (+1) ya da geri (-1) sıralıysa yönü, hiçbiri değilse 0."""
+    n = len(order)
+    cells = game.snake.indices()[::-1]  # kuyruktan başa
+    for direction in (1, -1):
+        span = 0
+        for a, b in zip(cells, cells[1:]):
+            d = (direction * (order[b] - order[a])) % n
+            if d == 0:
+                break
+            span += d
+        else:
+            if span < n:
+                return direction
+    return 0
+
+@register("hamilton")
+class HamiltonPolicy:
+    def __init__(self, shortcuts: bool = True, **heuristic):
+        self.shortcuts = shortcuts
+        self.fallback = HeuristicPolicy(**heuristic)
+        self.direction = 0  # döngü yönü (0 = henüz belirlenmedi)
+
+    def reset(self, game) -> None:
+        self.direction = 0
+        self.fallback.reset(game)
+
+    def get_state(self) -> dict:
+        return {"direction": self.direction, "fallback": self.fallback.get_state()}
+
+    def set_state(self, state: dict) -> None:
+        self.direction = state["direction"]
+        self.fallback.set_state(state["fallback"])
+
+    def decide(self, game) -> Pos:
+        order = cycle_order(game.cols, game.rows)
+        if order is None:
+            return self.fallback.decide(game)
+
+        # Yön, gövde değişmezi sağlayana kadar her tick denenir; sonra sabit kalır
+        direction = self.direction
+        if not direction:
+            direction = self.direction = _orientation(game, order)
+            if not direction:
+                return self.fallback.decide(game)
+
+        snake = game.snake
+        n = len(order)
+        head, tail = snake.head_idx, snake.tail_idx
+        h = order[head]
+
+        def ahead(i: int) -> int:
+            return (direction * (order[i] - h)) % n
+
+        to_tail = ahead(tail)
+        limit = to_tail - 1 if self.shortcuts else 1
+        if game.food is not None:
+            limit = min(limit, ahead(snake.index(game.food)))
+
+        best, best_d = -1, 0
+        for j in snake.adj[head]:
+            d = ahead(j)
+            if d == 1 and best_d == 0:
+                best, best_d = j, 1  # düz döngü adımı (kuyruğa basmak dahil)
+            elif 1 < d <= limit and d > best_d:
+                best, best_d = j, d
+
+        game.status = "cycle_shortcut" if best_d > 1 else "cycle"
+        return snake.cell_pos[best]
@@ -0,0 +1,194 @@
+"""
+Snake AI — Headless Engine
+
+Runs the same decision/physics loop as `game.SnakeAI` without pygame:
+no window, no clock and no `LOGIC_TPS` throttling. `HeadlessGame` owns the
+game state and `logic_tick()`; `SnakeAI` subclasses it and only adds drawing.
+`run_episode(seed, cols, rows)` plays one seeded game as fast as the CPU
+allows and returns a plain summary dict. Board size is a runtime parameter
+(`game.board`), so games of any size can share one process. The starting
+body lies horizontally left of the centre, so `start_len` must fit in
+`max_start_len(cols)` (ValueError otherwise). The decision maker is a
+`policy.Policy` (by registry name or instance); it is reset with the game
+and keeps its own counters. `recorder` (a `recording.Recorder`)
+logs every move when set; `run_episode(record=True)` returns the bytes.
+
+Randomness comes only from the game's own `rng` (`rng.make_rng`, kind "mt"
+or "counter"), never from the global `random` module, so a seed replays
+bit-for-bit regardless of other games, threads or processes.
+
+`regions` (a `regions.Regions`) labels the free space and is updated by
+`step_once` along with the free-cell pool.
+
+`snapshot()` captures the whole game — body, food, free-cell pool order,
+counters, policy state and RNG state — as a plain picklable dict (cells as
+`array`s); `restore(snap)` puts it back, so play continues exactly as it
+would have. Used to fork rollouts, reproduce failures and build fixtures.
+
+"""
+
+from array import array
+from collections import Counter
+from typing import Tuple, Optional, Dict, Any, Union
+
+from config import START_LEN, COLS, ROWS, POLICY
+from physics import spawn_food, step_once
+import instrument
+from grid import Board, get_board
+from policy import Policy, make_policy, policy_state, set_policy_state
+from recording import Recorder
+from regions import Regions
+from rng import make_rng, rng_kind
+from state import SnakeBody, FreeCells
+
+Pos = Tuple[int, int]
+
+def max_start_len(cols: int) -> int:
+    """Başlangıç gövdesi ortadan sola yatay uzanır: sığabilecek en uzun boy."""
+    return cols // 2 + 1
+
+class HeadlessGame:
+    def __init__(self, cols: int = COLS, rows: int = ROWS, seed: Optional[int] = None,
+                 start_len: int = START_LEN, policy: Union[str, Policy] = POLICY, rng: str = "mt"):
+        if not 1 <= start_len <= max_start_len(cols):
+            raise ValueError(f"start_len must be between 1 and {max_start_len(cols)} on a board {cols} wide, got {start_len}")
+        self.policy: Policy = make_policy(policy) if isinstance(policy, str) else policy
+        self.recorder: Optional[Recorder] = None
+        self.seed = seed
+        self.rng = make_rng(seed, rng)
+        self.board: Board = get_board(cols, rows)
+        self.cols = cols
+        self.rows = rows
+        self.start_len = start_len
+        self.steps = 0
+        self.reset()
+
+    def reset(self):
+        cx, cy = self.cols // 2, self.rows // 2
+        self.snake = SnakeBody(self.board, [(cx - i, cy) for i in range(self.start_len)])
+        self.dir = (1, 0)
+        self.alive = True
+        self.paused = False
+        self.score = 0
+        self.hiscore = getattr(self, "hiscore", 0)
+        self.free = FreeCells(self.board, self.snake.indices())
+        self.regions = Regions(self.snake)
+        self.food = spawn_food(self.snake, self.rng, self.board, self.free)
+        self.status = "init"
+        self.cause: Optional[str] = None  # step_once ölümde "wall" / "body" yazar
+        self.steps = 0
+        self.policy.reset(self)
+
+    def snapshot(self) -> Dict[str, Any]:
+        code = "H" if self.board.cells <= 0xFFFF else "I"
+        return {
+            "cols": self.cols,
+            "rows": self.rows,
+            "start_len": self.start_len,
+            "body": array(code, self.snake.indices()),
+            "free": array(code, self.free.order()),
+            "food": self.food,
+            "dir": self.dir,
+            "alive": self.alive,
+            "paused": self.paused,
+            "score": self.score,
+            "hiscore": self.hiscore,
+            "status": self.status,
+            "cause": self.cause,
+            "steps": self.steps,
+            "policy": self.policy.name,
+            "policy_state": policy_state(self.policy),
+            "rng_kind": rng_kind(self.rng),
+            "rng": self.rng.getstate(),
+        }
+
+    def restore(self, snap: Dict[str, Any]) -> None:
+        """snapshot() anındaki oyuna dön (politika adı farklıysa varsayılan ayarlarla kurulur)."""
+        self.cols, self.rows = snap["cols"], snap["rows"]
+        self.board = get_board(self.cols, self.rows)
+        self.start_len = snap["start_len"]
+        self.snake = SnakeBody(self.board, [self.board.pos(i) for i in snap["body"]])
+        self.free = FreeCells.from_order(self.board, snap["free"])
+        self.regions = Regions(self.snake)  # etiketler keyfi; boyutlar ve bağlantılar aynı
+        for name in ("food", "dir", "alive", "paused", "score", "hiscore", "status", "cause", "steps"):
+            setattr(self, name, snap[name])
+        if self.policy.name != snap["policy"]:
+            self.policy = make_policy(snap["policy"])
+        self.policy.reset(self)  # tahtaya göre yapıları kur, sonra sayaçları yükle
+        set_policy_state(self.policy, snap["policy_state"])
+        if rng_kind(self.rng) != snap["rng_kind"]:
+            self.rng = make_rng(0, snap["rng_kind"])
+        self.rng.setstate(snap["rng"])
+
+    @property
+    def won(self) -> bool:
+        return len(self.snake) >= self.cols * self.rows
+
+    def logic_tick(self):
+        if not self.alive or self.paused:
+            return
+
+        # Eğer harita dolduysa (Mükemmel oyun), oyunu durdur (alive=False yapabiliriz veya özel statü verebiliriz)
+        # Fizik motorunda çarpışma kontrolü var ama 'Win' durumu için buraya ekleyebilirsin.
+        if self.won:
+             self.alive = False
+             self.status = "MAP CLEARED!"
+             return
+
+        nxt = self.next_move()
+        if nxt is None:
+            return  # hamle henüz hazır değil (asenkron planlayıcı)
+        head = self.snake[0]
+        step_once(self, nxt)
+        self.steps += 1
+        if self.recorder is not None:
+            self.recorder.on_step(self, head)
+
+    def next_move(self) -> Optional[Pos]:
+        prof = instrument.ACTIVE
+        if prof is not None:
+            prof.begin()
+        nxt = self.policy.decide(self)
+        if prof is not None:
+            prof.end(self)
+        return nxt
+
+def run_episode(seed: int, cols: int = COLS, rows: int = ROWS,
+                start_len: int = START_LEN, max_steps: Optional[int] = None,
+                policy: str = POLICY, policy_options: Optional[Dict[str, Any]] = None,
+                record: bool = False, rng: str = "mt") -> Dict[str, Any]:
+    """Tek bir oyunu pencere açmadan sonuna kadar oynat ve özetini döndür."""
+    game = HeadlessGame(cols, rows, seed=seed, start_len=start_len,
+                        policy=make_policy(policy, **(policy_options or {})), rng=rng)
+    if record:
+        game.recorder = Recorder(game, seed)
+    if max_steps is None:
+        # Açlık sınırı yem başına total_cells * 2; bunun üstü döngüde takılmış demektir
+        max_steps = (cols * rows) ** 2 * 2
+    modes: Counter = Counter()
+    while game.alive and game.steps < max_steps:
+        before = game.steps
+        game.logic_tick()
+        if game.steps != before:
+            modes[game.status] += 1  # bu hamleyi hangi AI modu seçti
+    if game.alive:
+        game.cause = "timeout"
+    result = {
+        "seed": seed,
+        "cols": cols,
+        "rows": rows,
+        "start_len": start_len,
+        "policy": policy,
+        "score": game.score,
+        "length": len(game.snake),
+        "steps": game.steps,
+        "won": game.won,
+        "cause": game.cause,
+        "modes": dict(modes),
+    }
+    if game.recorder is not None:
+        result["recording"] = game.recorder.finish(game).to_bytes()
+    return result
+
+if __name__ == "__main__":
+    print(run_episode(0xBEEF))
@@ -0,0 +1,158 @@
+"""
+Snake AI — Decision Instrumentation (opt-in)
+
+Per-tick latency records for the policy's `decide`, without attaching cProfile to
+the whole process. While a `TickProfiler` is enabled, every decision tick
+records:
+- total wall time of the decision and time per stage (`STAGES`),
+- number of BFS calls and nodes expanded (reported by `search`),
+- snake length and the chosen `game.status`.
+
+When nothing is enabled (`ACTIVE is None`) the hooks cost one global lookup.
+Records can be exported as CSV or JSON; `hud_text()` feeds `ui.draw_hud`.
+
+    python instrument.py --size 30x30 --seed 1 --csv ticks.csv
+
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Optional, List, Dict, Any, Sequence
+
+STAGES = ("finisher", "connected", "bfs_food", "path_safety", "safe_neighbors", "lookahead", "endgame")
+
+ACTIVE: Optional["TickProfiler"] = None
+
+class TickProfiler:
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self._cur: Optional[Dict[str, Any]] = None
+        self._t0 = 0.0
+
+    def begin(self) -> None:
+        self._cur = {"bfs_calls": 0, "nodes": 0}
+        for name in STAGES:
+            self._cur[name + "_ms"] = 0.0
+        self._t0 = time.perf_counter()
+
+    def end(self, game) -> None:
+        rec = self._cur
+        if rec is None:
+            return
+        rec["total_ms"] = (time.perf_counter() - self._t0) * 1000.0
+        rec["tick"] = len(self.records)
+        rec["length"] = len(game.snake)
+        rec["status"] = game.status
+        self.records.append(rec)
+        self._cur = None
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self._cur is not None:
+                self._cur[name + "_ms"] += (time.perf_counter() - t0) * 1000.0
+
+    def bfs(self, nodes: int) -> None:
+        if self._cur is not None:
+            self._cur["bfs_calls"] += 1
+            self._cur["nodes"] += nodes
+
+    @property
+    def last(self) -> Optional[Dict[str, Any]]:
+        return self.records[-1] if self.records else None
+
+    def hud_text(self) -> str:
+        rec = self.last
+        if rec is None:
+            return ""
+        return f"tick {rec['total_ms']:.2f}ms  bfs {rec['bfs_calls']}  nodes {rec['nodes']}"
+
+    def columns(self) -> List[str]:
+        return ["tick", "length", "status", "total_ms", "bfs_calls", "nodes"] + [s + "_ms" for s in STAGES]
+
+    def write_csv(self, path: str) -> None:
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            w = csv.DictWriter(f, fieldnames=self.columns())
+            w.writeheader()
+            w.writerows(self.records)
+
+    def write_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.records, f)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Ölçüm başına ortalama / p95 / maksimum."""
+        out: Dict[str, Dict[str, float]] = {}
+        n = len(self.records)
+        if not n:
+            return out
+        for col in ["total_ms", "bfs_calls", "nodes"] + [s + "_ms" for s in STAGES]:
+            vals = sorted(r[col] for r in self.records)
+            out[col] = {"mean": sum(vals) / n, "p95": vals[min(n - 1, int(0.95 * n))], "max": vals[-1]}
+        return out
+
+def enable(profiler: Optional[TickProfiler] = None) -> TickProfiler:
+    global ACTIVE
+    ACTIVE = profiler or TickProfiler()
+    return ACTIVE
+
+def disable() -> Optional[TickProfiler]:
+    global ACTIVE
+    prof, ACTIVE = ACTIVE, None
+    return prof
+
+_NULL = nullcontext()
+
+def stage(name: str):
+    """`with stage("bfs_food"):` — profil kapalıyken hiçbir şey yapmaz."""
+    if ACTIVE is None:
+        return _NULL
+    return ACTIVE.stage(name)
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    # `python instrument.py` ile __main__ olarak çalışınca hook'lar "instrument" modülüne bakar
+    import instrument
+    import search
+    from headless import run_episode
+    from tournament import parse_size
+
+    ap = argparse.ArgumentParser(description="Profile policy decisions per tick on one headless game.")
+    ap.add_argument("--size", type=parse_size, default=None, help="e.g. 30x30 (default: config)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--max-steps", type=int, default=None)
+    ap.add_argument("--backend", choices=("python", "numpy"), default="python", help="search backend")
+    ap.add_argument("--policy", default=None, help="policy registry name (default: config.POLICY)")
+    ap.add_argument("--csv", default=None, help="write per-tick records as CSV")
+    ap.add_argument("--json", default=None, help="write per-tick records as JSON")
+    args = ap.parse_args(argv)
+
+    kwargs = {"max_steps": args.max_steps}
+    if args.policy:
+        kwargs["policy"] = args.policy
+    if args.size:
+        kwargs["cols"], kwargs["rows"] = args.size
+    search.set_backend(args.backend)
+    prof = instrument.enable()
+    try:
+        result = run_episode(args.seed, **kwargs)
+    finally:
+        instrument.disable()
+
+    if args.csv:
+        prof.write_csv(args.csv)
+    if args.json:
+        prof.write_json(args.json)
+    print(f"{len(prof.records)} ticks, score {result['score']}, cause {result['cause']}")
+    for col, s in prof.summary().items():
+        print(f"  {col:<18} mean={s['mean']:9.3f}  p95={s['p95']:9.3f}  max={s['max']:9.3f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
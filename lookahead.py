@@ -0,0 +1,221 @@
+"""
+Snake AI — Food Lookahead (expectimax over food placements)
+
+`simulate.simulate_path_and_check_safety` only asks "is the tail reachable
+right after this food?". Late-game deaths often come from a choice that only
+fails two or three foods later, so `Lookahead.score_moves` scores candidate
+moves over the next `depth` foods:
+- after a move the snake walks the shortest path to the food (simulated in
+  place on a private `SnakeBody` copy, undone afterwards),
+- eating with the tail unreachable scores 0; eating safely scores 1 plus the
+  mean value over `samples` random food placements (all free cells when
+  fewer, i.e. exact expectimax), down to `depth` foods,
+- a food with no path scores 0.5 if the tail is still reachable.
+Placements come from a private `random.Random`, so game seeds are untouched.
+
+Positions are cached in a transposition table keyed on a Zobrist hash of
+the body (one key per (cell, direction to the next segment), head marked)
+plus the food cell, updated incrementally per simulated step. The table is
+an LRU (`OrderedDict`) capped at `table_size` entries and survives across
+ticks, but not across games or snapshots (both start from an empty table).
+Search deepens iteratively (1..depth) under `budget_nodes` position
+expansions (table misses) per move and keeps the deepest fully completed
+scores, so results do not depend on machine speed; `budget_ms` adds an
+optional wall-clock cap (off by default). `<= 0` disables either.
+
+`LookaheadPolicy` (registered as "lookahead") runs the heuristic policy and
+vetoes its choice only when that move scores below `veto` (it traps the
+snake before the next food on average) and another legal move scores
+higher; otherwise the heuristic's anti-loop logic stays in charge. It
+activates above `min_fill` board fill.
+
+"""
+
+import random
+import time
+from collections import OrderedDict
+from typing import Tuple, List, Dict, Optional
+
+from ai import HeuristicPolicy
+from grid import Board
+from instrument import stage
+from policy import register
+from search import bfs_indices
+from state import SnakeBody
+from zobrist import Timeout, zobrist_keys, body_hash, advance, undo, legal_moves
+
+Pos = Tuple[int, int]
+
+class Lookahead:
+    def __init__(self, board: Board, depth: int = 3, samples: int = 4, budget_ms: float = 0.0,
+                 table_size: int = 1 << 16, seed: int = 0, budget_nodes: int = 500):
+        self.board = board
+        self.cols = board.cols
+        self.cells = board.cells
+        self.seg, self.food_key = zobrist_keys(board.cols, board.rows)
+        self.depth = depth
+        self.samples = samples
+        self.budget_ms = budget_ms
+        self.budget_nodes = budget_nodes
+        self.table_size = table_size
+        self.table: "OrderedDict[Tuple[int, int], float]" = OrderedDict()
+        self.rng = random.Random(seed)
+        self.hits = 0
+        self.misses = 0
+        self.reached = 0  # son aramada tamamlanan derinlik
+        self._deadline = 0.0
+        self._limit: float = 0  # bu karardaki misses sınırı
+
+    def clear(self) -> None:
+        self.table.clear()
+        self.hits = self.misses = 0
+
+    # --- arama -------------------------------------------------------------------
+
+    def _free_cells(self, snake: SnakeBody) -> List[int]:
+        occ = snake.occ
+        return [i for i in range(self.cells) if not occ[i]]
+
+    def _after_eat(self, snake: SnakeBody, h: int, depth: int) -> float:
+        """Yem yendi: kuyruk erişilebilirse 1 + yeni yem yerleşimlerinin ortalaması."""
+        if len(snake) >= self.cells:
+            return float(depth + 1)  # tahta doldu
+        if not snake.tail_reachable():
+            return 0.0
+        if depth <= 1:
+            return 1.0
+        free = self._free_cells(snake)
+        if len(free) > self.samples:
+            free = self.rng.sample(free, self.samples)
+        total = 0.0
+        for f in free:
+            total += self._value(snake, h, f, depth - 1)
+        return 1.0 + total / len(free)
+
+    def _value(self, snake: SnakeBody, h: int, food: int, depth: int) -> float:
+        """Yem `food`dayken sonraki `depth` yemin beklenen güvenli yenme sayısı."""
+        if self.misses > self._limit or time.perf_counter() > self._deadline:
+            raise Timeout
+        key = (h ^ self.food_key[food], depth)
+        table = self.table
+        cached = table.get(key)
+        if cached is not None:
+            table.move_to_end(key)
+            self.hits += 1
+            return cached
+        self.misses += 1
+
+        path = bfs_indices(snake.adj, snake.head_idx, food, snake.occ)
+        if path is None:
+            value = 0.5 if snake.tail_reachable() else 0.0
+        else:
+            dropped: List[int] = []
+            h2 = h
+            try:
+                for j in path[1:-1]:
+                    h2, t = advance(self.seg, snake, j, False, h2)
+                    dropped.append(t)
+                h2, t = advance(self.seg, snake, food, True, h2)
+                dropped.append(t)
+                value = self._after_eat(snake, h2, depth)
+            finally:
+                for t in reversed(dropped):
+                    undo(snake, t)
+
+        table[key] = value
+        if len(table) > self.table_size:
+            table.popitem(last=False)
+        return value
+
+    def _score_move(self, snake: SnakeBody, h: int, food: Optional[int], j: int, depth: int) -> float:
+        grow = j == food
+        h2, t = advance(self.seg, snake, j, grow, h)
+        try:
+            if grow:
+                return self._after_eat(snake, h2, depth)
+            if not snake.tail_reachable():
+                return 0.0
+            if food is None:
+                return 0.5
+            return self._value(snake, h2, food, depth)
+        finally:
+            undo(snake, t)
+
+    def score_moves(self, game) -> Dict[Pos, float]:
+        """Yasal hamle -> skor; bütçe ilk derinliğe bile yetmezse boş sözlük."""
+        snake = game.snake.copy()
+        if len(snake) < 2:
+            return {}
+        food = snake.index(game.food) if game.food is not None else None
+        moves = legal_moves(snake, food)
+        h = body_hash(snake)
+        budget = self.budget_ms / 1000.0 if self.budget_ms > 0 else float("inf")
+        self._deadline = time.perf_counter() + budget
+        self._limit = self.misses + self.budget_nodes if self.budget_nodes > 0 else float("inf")
+        scores: Dict[Pos, float] = {}
+        self.reached = 0
+        for depth in range(1, self.depth + 1):
+            try:
+                cur = {snake.cell_pos[j]: self._score_move(snake, h, food, j, depth) for j in moves}
+            except Timeout:
+                break
+            scores = cur
+            self.reached = depth
+        return scores
+
+@register("lookahead")
+class LookaheadPolicy:
+    def __init__(self, depth: int = 3, samples: int = 4, budget_ms: float = 0.0,
+                 table_size: int = 1 << 16, min_fill: float = 0.5, veto: float = 0.5,
+                 seed: int = 0, budget_nodes: int = 500, **heuristic):
+        self.depth = depth
+        self.samples = samples
+        self.budget_ms = budget_ms
+        self.budget_nodes = budget_nodes
+        self.table_size = table_size
+        self.min_fill = min_fill
+        self.veto = veto
+        self.seed = seed
+        self.heuristic = HeuristicPolicy(**heuristic)
+        self.search: Optional[Lookahead] = None
+
+    def reset(self, game) -> None:
+        self.heuristic.reset(game)
+        if self.search is None or self.search.board is not game.board:
+            self.search = Lookahead(game.board, self.depth, self.samples, self.budget_ms,
+                                    self.table_size, self.seed, self.budget_nodes)
+        else:
+            # Her oyun aynı yerleşim akışıyla başlar: sonuç önceki oyunlara bağlı kalmaz
+            self.search.clear()
+            self.search.rng.seed(self.seed)
+
+    def get_state(self) -> dict:
+        # Tablo kopyalanmaz: snapshot anında boşaltılır, geri yüklenen taraf da boş tabloyla
+        # devam eder; önbellek ve düğüm sayacı iki tarafta aynı kalır
+        search = self.search
+        if search is not None:
+            search.clear()
+        return {"heuristic": self.heuristic.get_state(),
+                "rng": search.rng.getstate() if search else None}
+
+    def set_state(self, state: dict) -> None:
+        self.heuristic.set_state(state["heuristic"])
+        if self.search is not None and state["rng"] is not None:
+            self.search.clear()
+            self.search.rng.setstate(state["rng"])
+
+    def decide(self, game) -> Pos:
+        choice = self.heuristic.decide(game)
+        if len(game.snake) < self.min_fill * game.cols * game.rows:
+            return choice
+        with stage("lookahead"):
+            scores = self.search.score_moves(game)
+        if not scores:
+            return choice
+        best = max(scores, key=scores.get)
+        # Yalnızca sıkışmaya giden sezgisel seçimi değiştir
+        mine = scores.get(choice, -1.0)
+        if mine < self.veto and scores[best] > mine:
+            game.status = "lookahead"
+            return best
+        return choice
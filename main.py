@@ -1,4 +1,17 @@
-from game import SnakeAI
+import argparse
+
+from config import POLICY, ASYNC_AI, RECORD_PATH
+import policy
 
 if __name__ == "__main__":
-    SnakeAI().run()
+    ap = argparse.ArgumentParser(description="Watch the Snake AI play.")
+    ap.add_argument("--policy", choices=policy.available(), default=POLICY)
+    ap.add_argument("--policy-opt", nargs="*", default=[], metavar="KEY=VALUE")
+    ap.add_argument("--async", dest="async_ai", action="store_true", default=ASYNC_AI,
+                    help="plan moves ahead in a background thread")
+    ap.add_argument("--record", default=RECORD_PATH, help="append binary game recordings to this file")
+    args = ap.parse_args()
+    from game import SnakeAI  # pygame yalnızca pencere açılacaksa yüklenir
+    options = policy.scope_options(policy.parse_options(args.policy_opt), args.policy)
+    SnakeAI(policy=policy.make_policy(args.policy, **options),
+            async_ai=args.async_ai, record=args.record).run()
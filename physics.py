@@ -2,27 +2,36 @@
 Snake AI — Physics & Rules (updated 2025-11-05 12:18)
 
 Implements collision rules with tail exception and growth, plus uniform random
-food spawning from the set of empty cells. All logic is parameterized by
-`config.COLS/ROWS` and thus correct for any board size.
+food spawning from the empty cells, drawn from the game's own RNG
+(`game.rng`, see `rng.py`). `step_once` requires the game to keep a
+`state.FreeCells` pool (`game.free`) and the free-space labels
+(`game.regions`, see `regions.py`) and updates both per move, so spawning
+is O(1). Only a direct `spawn_food` call without a pool rebuilds the empty
+set. All logic is parameterized by the game's `grid.Board` and thus correct
+for any board size.
 
 """
 
 import random
-from collections import deque
-from typing import Tuple, Deque, Optional, Set
+from typing import Tuple, Iterable, Optional, Set
 
-from config import COLS, ROWS
-from grid import in_bounds
+from grid import Board, DEFAULT_BOARD
+from state import FreeCells
 Pos = Tuple[int, int]
 
-def spawn_food(snake: Deque[Pos]) -> Optional[Pos]:
-    empty: Set[Pos] = {(x, y) for x in range(COLS) for y in range(ROWS)} - set(snake)
-    return random.choice(tuple(empty)) if empty else None
+def spawn_food(snake: Iterable[Pos], rng: random.Random, board: Board = DEFAULT_BOARD,
+               free: Optional[FreeCells] = None) -> Optional[Pos]:
+    if free is not None:
+        i = free.choice(rng)
+        return None if i is None else board.pos(i)
+    empty: Set[Pos] = {(x, y) for x in range(board.cols) for y in range(board.rows)} - set(snake)
+    return rng.choice(tuple(empty)) if empty else None
 
 def step_once(game, nxt: Pos) -> None:
     """Gerçek oyunda bir hamle uygula (doğru kuyruk kuralıyla)."""
-    if not in_bounds(nxt):
+    if not game.board.in_bounds(nxt):
         game.alive = False
+        game.cause = "wall"
         return
 
     tail = game.snake[-1]
@@ -31,11 +40,19 @@ def step_once(game, nxt: Pos) -> None:
     # Çarpışma (tail istisnası)
     if (nxt in game.snake) and (nxt != tail or will_eat):
         game.alive = False
+        game.cause = "body"
         return
 
-    game.snake.appendleft(nxt)
+    snake, free, regions = game.snake, game.free, game.regions
+    i = game.board.index(nxt)
+    snake.push_head(i)
+    free.discard(i)
+    regions.occupy(i)
     if will_eat:
         game.score += 1
-        game.food = spawn_food(game.snake)
+        game.food = spawn_food(snake, game.rng, game.board, free)
     else:
-        game.snake.pop()
+        t = snake.pop_tail()
+        if not snake.occ[t]:  # kafa kuyruğun yerine geçtiyse hücre dolu kalır
+            free.add(t)
+            regions.release(t)
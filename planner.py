@@ -0,0 +1,126 @@
+"""
+Snake AI — Background Move Planner
+
+Moves the policy off the render thread. A `Planner` owns a worker thread
+that plays the policy ahead on a shadow copy of the game (its own
+`SnakeBody`, same food) and queues `(move, status)` pairs, up to `horizon`
+moves ahead. The render loop only pops ready moves, so a slow decision
+delays the snake instead of freezing frames.
+
+A plan is valid while the food stays put: the shadow stops after a move
+that eats (the next food is only known once the real game spawns it) or
+fills the board, and the game calls `restart(game)` to resynchronise after
+eating or resetting. The policy is used by one thread at a time: the
+worker holds `lock` while deciding, and `restart`/`reset` take it too.
+
+"""
+
+import threading
+from collections import deque
+from typing import Tuple, Optional, Deque
+
+import instrument
+from state import SnakeBody
+
+Pos = Tuple[int, int]
+
+class _Shadow:
+    """Politikanın okuduğu alanlar: gerçek oyunun bağımsız bir kopyası."""
+
+    def __init__(self, game):
+        self.board = game.board
+        self.cols = game.cols
+        self.rows = game.rows
+        self.snake: SnakeBody = game.snake.copy()
+        self.food: Optional[Pos] = game.food
+        self.score = game.score
+        self.status = game.status
+        self.alive = game.alive
+        self.done = not game.alive or game.food is None
+
+    def advance(self, move: Pos) -> None:
+        """Hamleyi gölge gövdeye uygula; yem yenir ya da çarpışma olursa plan biter."""
+        snake = self.snake
+        if not snake.in_bounds(move):
+            self.done = True
+            return
+        i = snake.index(move)
+        if move == self.food:
+            snake.push_head(i)
+            self.score += 1
+            self.done = True  # yeni yemi ancak gerçek oyun bilir
+            return
+        if snake.occ[i] and i != snake.tail_idx:
+            self.done = True
+            return
+        snake.pop_tail()
+        snake.push_head(i)
+        if len(snake) >= self.cols * self.rows:
+            self.done = True
+
+class Planner:
+    def __init__(self, policy, horizon: int = 16):
+        self.policy = policy
+        self.horizon = horizon
+        self.lock = threading.Lock()  # politika aynı anda tek iş parçacığında
+        self._cv = threading.Condition()
+        self._moves: Deque[Tuple[Pos, str]] = deque()
+        self._shadow: Optional[_Shadow] = None
+        self._gen = 0
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="snake-planner", daemon=True)
+        self._thread.start()
+
+    def restart(self, game) -> None:
+        """Planı at, gerçek oyundan yeni gölge kur (yem yendikten / reset'ten sonra)."""
+        with self.lock, self._cv:
+            self._gen += 1
+            self._moves.clear()
+            self._shadow = _Shadow(game)
+            self._cv.notify_all()
+
+    def next_move(self) -> Optional[Tuple[Pos, str]]:
+        """Hazır hamle varsa (move, status); yoksa None — beklemez."""
+        with self._cv:
+            if not self._moves:
+                return None
+            planned = self._moves.popleft()
+            self._cv.notify_all()
+            return planned
+
+    def __len__(self) -> int:
+        return len(self._moves)
+
+    def close(self) -> None:
+        with self._cv:
+            self._stop = True
+            self._cv.notify_all()
+        self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        cv = self._cv
+        while True:
+            with cv:
+                while not self._stop and (self._shadow is None or self._shadow.done
+                                          or len(self._moves) >= self.horizon):
+                    cv.wait()
+                if self._stop:
+                    return
+                gen, shadow = self._gen, self._shadow
+
+            with self.lock:
+                if gen != self._gen:
+                    continue  # bu arada restart edildi
+                prof = instrument.ACTIVE
+                if prof is not None:
+                    prof.begin()
+                move = self.policy.decide(shadow)
+                if prof is not None:
+                    prof.end(shadow)
+
+            with cv:
+                if gen != self._gen:
+                    continue
+                self._moves.append((move, shadow.status))
+                shadow.advance(move)
+                cv.notify_all()
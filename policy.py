@@ -0,0 +1,115 @@
+"""
+Snake AI — Policy Interface & Registry
+
+A policy turns the current game state into the next head cell:
+- `reset(state)` is called once per game (after `HeadlessGame.reset`),
+- `decide(state) -> (x, y)` is called once per logic tick.
+Any counters a policy needs (starvation, anti-loop, cycle direction, ...)
+live on the policy object, never on the game, so games stay plain state.
+Policies may add `get_state()` / `set_state(state)` so game snapshots can
+carry them (`policy_state` falls back to a deep copy of the attributes).
+
+Policies register under a name with `@register("name")`. `make_policy(name,
+**options)` builds one; options are passed to the constructor, so every
+policy takes its own config (e.g. `make_policy("heuristic", tail_fill=0.75)`).
+The default name comes from `config.POLICY`.
+
+On the command line (`--policy-opt`) an option can be scoped to one policy
+as `name.key=value` (e.g. `hamilton.shortcuts=false`); unscoped options go to
+every policy. `scope_options` picks one policy's share and `check_options`
+builds each policy once, so a bad option fails before any game starts.
+
+"""
+
+import copy
+from typing import Tuple, Dict, Any, Callable, List, Sequence, Protocol
+
+Pos = Tuple[int, int]
+
+class Policy(Protocol):
+    name: str
+
+    def reset(self, state) -> None: ...
+
+    def decide(self, state) -> Pos: ...
+
+REGISTRY: Dict[str, Callable[..., "Policy"]] = {}
+
+def register(name: str):
+    """Sınıf dekoratörü: politikayı `name` adıyla kaydet."""
+    def deco(cls):
+        cls.name = name
+        REGISTRY[name] = cls
+        return cls
+    return deco
+
+def _load_builtin() -> None:
+    # Yerleşik politikalar modül import edilince kaydolur
+    import ai, hamilton, lookahead  # noqa: F401
+
+def available() -> List[str]:
+    _load_builtin()
+    return sorted(REGISTRY)
+
+def make_policy(name: str, **options: Any) -> "Policy":
+    _load_builtin()
+    if name not in REGISTRY:
+        raise ValueError(f"unknown policy {name!r}; choose from {sorted(REGISTRY)}")
+    return REGISTRY[name](**options)
+
+def policy_state(policy: "Policy") -> Any:
+    """Politikanın sayaçlarının kopyası (snapshot için)."""
+    if hasattr(policy, "get_state"):
+        return policy.get_state()
+    return copy.deepcopy(vars(policy))
+
+def set_policy_state(policy: "Policy", state: Any) -> None:
+    if hasattr(policy, "set_state"):
+        policy.set_state(state)
+    else:
+        vars(policy).update(copy.deepcopy(state))
+
+def scope_options(options: Dict[str, Any], name: str) -> Dict[str, Any]:
+    """`name` politikasının seçenekleri: önekisizler + "name." önekliler (önek atılır)."""
+    out: Dict[str, Any] = {}
+    for key, value in options.items():
+        scope, dot, field = key.rpartition(".")
+        if not dot:
+            out[key] = value
+        elif scope == name:
+            out[field] = value
+    return out
+
+def check_options(options: Dict[str, Any], names: Sequence[str]) -> None:
+    """Her politikayı kendi seçenekleriyle bir kez kur; uymayan seçenekte ValueError."""
+    for key in options:
+        scope, dot, _ = key.rpartition(".")
+        if dot and scope not in names:
+            raise ValueError(f"option {key!r} is scoped to {scope!r}, which is not among {list(names)}")
+    for name in names:
+        try:
+            make_policy(name, **scope_options(options, name))
+        except TypeError as e:
+            raise ValueError(f"{name}: {e} (scope an option to one policy as NAME.KEY=VALUE)") from None
+
+def parse_options(items: Sequence[str]) -> Dict[str, Any]:
+    """CLI için: ["tail_fill=0.75", "shortcuts=false"] -> {"tail_fill": 0.75, "shortcuts": False}"""
+    out: Dict[str, Any] = {}
+    for item in items:
+        key, sep, raw = item.partition("=")
+        if not sep or not key:
+            raise ValueError(f"expected KEY=VALUE, got {item!r}")
+        low = raw.strip().lower()
+        value: Any
+        if low in ("true", "false"):
+            value = low == "true"
+        else:
+            try:
+                value = int(raw)
+            except ValueError:
+                try:
+                    value = float(raw)
+                except ValueError:
+                    value = raw
+        out[key.strip().replace("-", "_")] = value
+    return out
@@ -0,0 +1,275 @@
+"""
+Snake AI — Game Recordings & Replay
+
+Compact binary game records for archiving many games:
+- header: magic, board size, seed, cause of death, counts, start head cell,
+- start body as 2-bit directions (head -> tail),
+- one 2-bit direction per move (4 moves per byte; order of `DIRS`),
+- every food position in spawn order (uint16 cells, uint32 on huge boards).
+The deadly last move is not stored (the state does not change); `cause`
+tells how the game ended. A 10x10 game of ~2000 moves takes ~600 bytes.
+Records are simply concatenated in one file; `scan()` reads only headers.
+
+`Recorder` is attached to a `HeadlessGame` (`run_episode(record=True)`,
+`tournament.py --record`, `SnakeAI(record=...)`). `Replay` rebuilds states
+without any AI: one pass at load keeps a keyframe every `every` ticks, so
+`state_at(t)` replays at most `every` moves.
+
+    python recording.py games.snkr --game 3 --seek 500    # görüntüleyici
+
+"""
+
+import argparse
+import struct
+import sys
+from typing import Tuple, List, Optional, Iterator, Sequence, BinaryIO, Dict
+
+from grid import Board, get_board
+from state import SnakeBody
+
+Pos = Tuple[int, int]
+
+MAGIC = b"SNKR"
+VERSION = 1
+DIRS: Tuple[Pos, ...] = ((1, 0), (-1, 0), (0, 1), (0, -1))  # grid.neighbors sırası
+CAUSES = (None, "wall", "body", "timeout")
+
+# magic, sürüm, cols, rows, bayrak (1 = seed var), seed, ölüm nedeni,
+# başlangıç uzunluğu, hamle sayısı, yem sayısı, başlangıç baş hücresi
+HEADER = struct.Struct("<4sBHHBqBIIII")
+
+def direction(a: Pos, b: Pos) -> int:
+    """a'dan komşu b'ye yön kodu (DIRS indeksi)."""
+    return DIRS.index((b[0] - a[0], b[1] - a[1]))
+
+def pack2(codes: Sequence[int]) -> bytes:
+    """2-bit kodlar, bayt başına 4 (düşük bitler önce)."""
+    out = bytearray((len(codes) + 3) // 4)
+    for k, c in enumerate(codes):
+        out[k >> 2] |= c << ((k & 3) * 2)
+    return bytes(out)
+
+def unpack2(data: bytes, n: int) -> bytearray:
+    out = bytearray(n)
+    for k in range(n):
+        out[k] = (data[k >> 2] >> ((k & 3) * 2)) & 3
+    return out
+
+class Recording:
+    def __init__(self, cols: int, rows: int, body: List[int], seed: Optional[int] = None,
+                 moves: Optional[bytearray] = None, foods: Optional[List[int]] = None,
+                 cause: Optional[str] = None):
+        self.cols = cols
+        self.rows = rows
+        self.seed = seed
+        self.body = body                    # başlangıç gövdesi, baştan kuyruğa (hücre indeksleri)
+        self.moves = moves if moves is not None else bytearray()
+        self.foods = foods if foods is not None else []
+        self.cause = cause
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def _food_format(self) -> str:
+        return "H" if self.cols * self.rows <= 0xFFFF else "I"
+
+    def to_bytes(self) -> bytes:
+        cols = self.cols
+        cells = [(i % cols, i // cols) for i in self.body]
+        body_dirs = [direction(a, b) for a, b in zip(cells, cells[1:])]
+        head = HEADER.pack(MAGIC, VERSION, self.cols, self.rows, 0 if self.seed is None else 1,
+                           self.seed or 0, CAUSES.index(self.cause), len(self.body),
+                           len(self.moves), len(self.foods), self.body[0])
+        foods = struct.pack(f"<{len(self.foods)}{self._food_format()}", *self.foods)
+        return head + pack2(body_dirs) + pack2(self.moves) + foods
+
+    @classmethod
+    def from_bytes(cls, buf: bytes, offset: int = 0) -> Tuple["Recording", int]:
+        """(kayıt, sonraki kaydın ofseti)"""
+        magic, version, cols, rows, flags, seed, cause, body_len, n_moves, n_foods, head = \
+            HEADER.unpack_from(buf, offset)
+        _check_header(magic, version, offset)
+        pos = offset + HEADER.size
+        nb = (body_len - 1 + 3) // 4
+        body_dirs = unpack2(buf[pos:pos + nb], body_len - 1)
+        pos += nb
+        nm = (n_moves + 3) // 4
+        moves = unpack2(buf[pos:pos + nm], n_moves)
+        pos += nm
+        rec = cls(cols, rows, [head], seed if flags & 1 else None, moves, cause=CAUSES[cause])
+        fmt = rec._food_format()
+        rec.foods = list(struct.unpack_from(f"<{n_foods}{fmt}", buf, pos))
+        pos += n_foods * struct.calcsize(fmt)
+        x, y = head % cols, head // cols
+        for d in body_dirs:
+            dx, dy = DIRS[d]
+            x, y = x + dx, y + dy
+            rec.body.append(y * cols + x)
+        return rec, pos
+
+def _check_header(magic: bytes, version: int, offset: int) -> None:
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not a snake recording at byte {offset} (magic {magic!r}, version {version})")
+
+def write(f: BinaryIO, rec: Recording) -> None:
+    f.write(rec.to_bytes())
+
+def append(path: str, rec: Recording) -> None:
+    with open(path, "ab") as f:
+        write(f, rec)
+
+def read_all(path: str) -> Iterator[Recording]:
+    with open(path, "rb") as f:
+        buf = f.read()
+    pos = 0
+    while pos < len(buf):
+        rec, pos = Recording.from_bytes(buf, pos)
+        yield rec
+
+def scan(path: str) -> Iterator[Dict[str, object]]:
+    """Yalnızca başlıkları oku (hamleler çözülmez): boyut, seed, neden, hamle/yem sayısı."""
+    with open(path, "rb") as f:
+        buf = f.read()
+    pos = 0
+    while pos < len(buf):
+        magic, version, cols, rows, flags, seed, cause, body_len, n_moves, n_foods, _ = \
+            HEADER.unpack_from(buf, pos)
+        _check_header(magic, version, pos)
+        food_size = 2 if cols * rows <= 0xFFFF else 4
+        yield {"offset": pos, "cols": cols, "rows": rows, "seed": seed if flags & 1 else None,
+               "cause": CAUSES[cause], "start_len": body_len, "steps": n_moves, "foods": n_foods}
+        pos += HEADER.size + (body_len + 2) // 4 + (n_moves + 3) // 4 + n_foods * food_size
+
+class Recorder:
+    """Oyunun her başarılı hamlesini ve her yeni yemi kaydeder."""
+
+    def __init__(self, game, seed: Optional[int] = None):
+        self.board: Board = game.board
+        self.rec = Recording(game.cols, game.rows, game.snake.indices(), seed)
+        self.food: Optional[Pos] = None
+        self._note_food(game)
+
+    def _note_food(self, game) -> None:
+        if game.food is not None and game.food != self.food:
+            self.rec.foods.append(self.board.index(game.food))
+        self.food = game.food
+
+    def on_step(self, game, head: Pos) -> None:
+        """step_once'tan sonra çağrılır; head = hamleden önceki baş."""
+        if not game.alive:
+            return  # ölümcül hamle durumu değiştirmez
+        self.rec.moves.append(direction(head, game.snake[0]))
+        self._note_food(game)
+
+    def finish(self, game) -> Recording:
+        self.rec.cause = game.cause if game.cause in CAUSES else None
+        return self.rec
+
+class Replay:
+    """Kayıttan durum kurma; `every` tick'te bir ara kare ile hızlı atlama."""
+
+    def __init__(self, rec: Recording, every: int = 256):
+        self.rec = rec
+        self.board = get_board(rec.cols, rec.rows)
+        self.every = every
+        self.keyframes: List[Tuple[List[int], int, int]] = []  # (gövde, yem imleci, skor)
+        snake = SnakeBody(self.board, [self.board.pos(i) for i in rec.body])
+        cursor = score = 0
+        for t in range(len(rec.moves) + 1):
+            if t % every == 0:
+                self.keyframes.append((snake.indices(), cursor, score))
+            if t < len(rec.moves):
+                cursor, score = self._apply(snake, rec.moves[t], cursor, score)
+
+    def __len__(self) -> int:
+        return len(self.rec.moves)
+
+    def _apply(self, snake: SnakeBody, code: int, cursor: int, score: int) -> Tuple[int, int]:
+        dx, dy = DIRS[code]
+        x, y = self.board.pos(snake.head_idx)
+        i = self.board.index((x + dx, y + dy))
+        foods = self.rec.foods
+        if cursor < len(foods) and i == foods[cursor]:
+            snake.push_head(i)
+            return cursor + 1, score + 1
+        snake.pop_tail()
+        snake.push_head(i)
+        return cursor, score
+
+    def state_at(self, t: int) -> Tuple[SnakeBody, Optional[Pos], int]:
+        """t. hamleden sonraki (gövde, yem, skor); t = 0 başlangıç."""
+        t = max(0, min(t, len(self.rec.moves)))
+        body, cursor, score = self.keyframes[t // self.every]
+        snake = SnakeBody(self.board)
+        for i in body:
+            snake.push_tail(i)
+        for k in range(t - t % self.every, t):
+            cursor, score = self._apply(snake, self.rec.moves[k], cursor, score)
+        foods = self.rec.foods
+        food = self.board.pos(foods[cursor]) if cursor < len(foods) else None
+        return snake, food, score
+
+def view(rec: Recording, start: int = 0, tps: float = 12.0) -> None:
+    """Pencerede oynat. Boşluk: duraklat, ←/→: tek adım, PgUp/PgDn: ±100, Home/End."""
+    import pygame as pg
+    import ui
+    from config import BASE_FPS
+
+    replay = Replay(rec)
+    board = replay.board
+    screen, clock, font, bigfont, sprites = ui.init_ui(board)
+    background = ui.build_background(sprites["floor"], board)
+    t, playing, accum = start, True, 0.0
+    while True:
+        for event in pg.event.get():
+            if event.type == pg.QUIT or (event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE):
+                pg.quit()
+                return
+            if event.type == pg.KEYDOWN:
+                step = {pg.K_RIGHT: 1, pg.K_LEFT: -1, pg.K_PAGEDOWN: 100, pg.K_PAGEUP: -100}.get(event.key)
+                if event.key == pg.K_SPACE:
+                    playing = not playing
+                elif event.key == pg.K_HOME:
+                    t = 0
+                elif event.key == pg.K_END:
+                    t = len(replay)
+                elif step is not None:
+                    t += step
+        if playing:
+            accum += clock.get_time() / 1000.0
+            while accum >= 1.0 / tps:
+                t += 1
+                accum -= 1.0 / tps
+        t = max(0, min(t, len(replay)))
+
+        snake, food, score = replay.state_at(t)
+        screen.blit(background, (0, 0))
+        ui.draw_food(screen, food, sprites["food"])
+        ui.draw_snake(screen, snake, sprites)
+        status = f"replay {t}/{len(replay)}" + (f"  end: {rec.cause}" if t == len(replay) and rec.cause else "")
+        ui.draw_hud(screen, font, score, score, status, t / tps)
+        pg.display.flip()
+        clock.tick(BASE_FPS)
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="List or replay recorded Snake AI games.")
+    ap.add_argument("path")
+    ap.add_argument("--game", type=int, default=None, help="record number to replay (default: list)")
+    ap.add_argument("--seek", type=int, default=0, help="start at this tick")
+    ap.add_argument("--tps", type=float, default=12.0, help="replay speed, ticks per second")
+    args = ap.parse_args(argv)
+
+    if args.game is None:
+        for k, head in enumerate(scan(args.path)):
+            print(f"#{k:<6} {head['cols']}x{head['rows']}  seed={head['seed']}  steps={head['steps']}  "
+                  f"foods={head['foods']}  cause={head['cause']}")
+        return 0
+    for k, rec in enumerate(read_all(args.path)):
+        if k == args.game:
+            view(rec, args.seek, args.tps)
+            return 0
+    print(f"no game #{args.game} in {args.path}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""
+Snake AI — Incremental Free-Space Regions
+
+`Regions` labels the connected regions of free cells (4-neighbourhood). The
+game keeps one next to its body (`game.regions`) and `physics.step_once`
+updates it per move, so connectivity questions cost O(1) instead of a flood
+fill per tick. Only two cells change per move:
+- `release(i)` (the tail left i): i joins its free neighbours' regions; when
+  it bridges several, the smaller ones are relabelled into the largest
+  (small-to-large, so a cell is relabelled O(log n) times overall),
+- `occupy(i)` (the head entered i): when the free cells among the eight
+  around i keep i's free 4-neighbours in one run of the ring, removing i
+  cannot split the region (O(1) local test). Otherwise the free neighbours
+  are flood-filled in lockstep; searches that meet merge, and the fill stops
+  as soon as a single search is left, so only the pockets that were cut off
+  are visited and relabelled — the large side keeps its label.
+Queries:
+- `size(i)`, `group(i)` and `connected(a, b)` on free cells plus the tail
+  (the graph `simulate.TickContext` uses; the tail is about to move away),
+- `move_area(j)`: the largest piece of free space left once the head enters
+  j (the room the snake still has; the cell the tail frees is not counted),
+  and `move_cutoff(j)`: how many free cells of j's region that move leaves
+  behind in pockets.
+
+"""
+
+from typing import Dict, List, Tuple
+
+from grid import Board
+from state import SnakeBody
+
+TAIL = -1  # group(): kuyruğa bağlı bölgeler tek grup
+
+def ring_table(board: Board) -> Tuple[Tuple[int, ...], ...]:
+    """Hücre -> çevresindeki 8 hücre, çember sırasıyla (tahta dışı -1); çift sıradakiler 4-komşu."""
+    cols, rows = board.cols, board.rows
+    steps = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+    table = []
+    for i in range(board.cells):
+        x, y = i % cols, i // cols
+        table.append(tuple((y + dy) * cols + x + dx if 0 <= x + dx < cols and 0 <= y + dy < rows else -1
+                           for dx, dy in steps))
+    return tuple(table)
+
+_RINGS: Dict[Board, Tuple[Tuple[int, ...], ...]] = {}
+
+class Regions:
+    def __init__(self, snake: SnakeBody):
+        self.snake = snake
+        self.board = snake.board
+        self.adj = snake.adj
+        ring = _RINGS.get(self.board)
+        if ring is None:
+            ring = _RINGS[self.board] = ring_table(self.board)
+        self.ring = ring
+        self.label: List[int] = [0] * self.board.cells  # 0 = gövde
+        self.sizes: Dict[int, int] = {}
+        self._next = 1
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Sıfırdan etiketle (reset / restore / gövde dışarıdan değişince)."""
+        label, occ, adj = self.label, self.snake.occ, self.adj
+        for i in range(len(label)):
+            label[i] = 0
+        self.sizes.clear()
+        for start in range(len(label)):
+            if occ[start] or label[start]:
+                continue
+            lab = self._new_label()
+            label[start] = lab
+            stack = [start]
+            size = 0
+            while stack:
+                u = stack.pop()
+                size += 1
+                for v in adj[u]:
+                    if not occ[v] and not label[v]:
+                        label[v] = lab
+                        stack.append(v)
+            self.sizes[lab] = size
+
+    def _new_label(self) -> int:
+        lab = self._next
+        self._next += 1
+        return lab
+
+    # --- sorgular --------------------------------------------------------------------
+
+    def size(self, i: int) -> int:
+        """Boş i hücresinin bölge boyutu (gövdeyse 0)."""
+        lab = self.label[i]
+        return self.sizes[lab] if lab else 0
+
+    def group(self, i: int) -> int:
+        """Boş hücreler + kuyruk grafında i'nin grubu: 0 gövde, TAIL kuyruğa bağlı bölge."""
+        tail = self.snake.tail_idx
+        if i == tail:
+            return TAIL
+        lab = self.label[i]
+        if not lab:
+            return 0
+        label = self.label
+        for n in self.adj[tail]:
+            if label[n] == lab:
+                return TAIL
+        return lab
+
+    def connected(self, a: int, b: int) -> bool:
+        ga = self.group(a)
+        return ga != 0 and ga == self.group(b)
+
+    def move_area(self, j: int) -> int:
+        """Baş j'ye girince kullanabileceği en büyük boş parça (j kuyruksa komşu bölgelerin en büyüğü)."""
+        lab = self.label[j]
+        if not lab:
+            return max((self.size(n) for n in self.adj[j]), default=0)
+        seeds = [n for n in self.adj[j] if self.label[n] == lab]
+        if not seeds:
+            return 0
+        if self._single_run(j):
+            return self.sizes[lab] - 1
+        pieces, rest = self._pieces(j, seeds, lab)
+        return max([rest] + [len(p) for p in pieces])
+
+    def move_cutoff(self, j: int) -> int:
+        """Baş j'ye girince j'nin bölgesinden ulaşılamaz kalan hücre sayısı (kuyruk hamlesi 0)."""
+        lab = self.label[j]
+        if not lab:
+            return 0
+        return self.sizes[lab] - 1 - self.move_area(j)
+
+    # --- güncellemeler ------------------------------------------------------------------
+
+    def release(self, i: int) -> None:
+        """i boşaldı (kuyruk ayrıldı)."""
+        label, sizes = self.label, self.sizes
+        labs = {label[n] for n in self.adj[i]}
+        labs.discard(0)
+        if not labs:
+            lab = self._new_label()
+            label[i] = lab
+            sizes[lab] = 1
+            return
+        keep = max(labs, key=sizes.__getitem__)
+        label[i] = keep
+        sizes[keep] += 1
+        for lab in labs:
+            if lab != keep:
+                sizes[keep] += self._relabel(i, lab, keep)
+                del sizes[lab]
+
+    def occupy(self, i: int) -> None:
+        """i doldu (baş girdi); bölge bölündüyse kopan cepler yeni etiket alır."""
+        label, sizes = self.label, self.sizes
+        lab = label[i]
+        if not lab:
+            return
+        label[i] = 0
+        sizes[lab] -= 1
+        if not sizes[lab]:
+            del sizes[lab]
+            return
+        seeds = [n for n in self.adj[i] if label[n] == lab]
+        if len(seeds) < 2 or self._single_run(i):
+            return
+        pieces, rest = self._pieces(i, seeds, lab)
+        if not rest:
+            # Tüm parçalar bitti: en büyüğü eski etiketi korur
+            pieces.sort(key=len)
+            rest = len(pieces.pop())
+        for cells in pieces:
+            new = self._new_label()
+            for c in cells:
+                label[c] = new
+            sizes[new] = len(cells)
+        sizes[lab] = rest
+
+    # --- yardımcılar ---------------------------------------------------------------------
+
+    def _relabel(self, start_from: int, old: int, new: int) -> int:
+        """`old` etiketli, start_from'a komşu bölgeyi `new` yap; hücre sayısını döndür."""
+        label, adj = self.label, self.adj
+        stack = [n for n in adj[start_from] if label[n] == old]
+        for n in stack:
+            label[n] = new
+        count = len(stack)
+        while stack:
+            u = stack.pop()
+            for v in adj[u]:
+                if label[v] == old:
+                    label[v] = new
+                    count += 1
+                    stack.append(v)
+        return count
+
+    def _single_run(self, i: int) -> bool:
+        """i'nin boş 4-komşuları 8'li çemberde tek bir ardışık boş dizide mi? (Öyleyse i kesme noktası değil.)"""
+        label = self.label
+        ring = self.ring[i]
+        free = [c >= 0 and label[c] != 0 for c in ring]
+        if all(free):
+            return True
+        # Dolu bir hücreden başlayıp çemberi dolaş; 4-komşu içeren boş dizileri say
+        start = free.index(False)
+        runs = 0
+        inside = False
+        has_orth = False
+        for k in range(1, 9):
+            p = (start + k) % 8
+            if free[p]:
+                if not inside:
+                    inside, has_orth = True, False
+                if p % 2 == 0:
+                    has_orth = True
+            elif inside:
+                inside = False
+                runs += has_orth
+        return runs <= 1
+
+    def _pieces(self, block: int, seeds: List[int], lab: int) -> Tuple[List[List[int]], int]:
+        """
+        `block` dolu sayılınca seeds'ten eşzamanlı flood fill. Buluşan aramalar
+        birleşir; tek arama kalınca durulur. (biten parçalar, kalan parçanın
+        boyutu — hiç kalmadıysa 0).
+        """
+        label, adj = self.label, self.adj
+        owner: Dict[int, int] = {}
+        parent = list(range(len(seeds)))
+
+        def find(g: int) -> int:
+            while parent[g] != g:
+                parent[g] = parent[parent[g]]
+                g = parent[g]
+            return g
+
+        cells: Dict[int, List[int]] = {}
+        frontier: Dict[int, List[int]] = {}
+        for g, s in enumerate(seeds):
+            if s in owner:  # aynı tohum iki kez gelmez ama güvenli olsun
+                continue
+            owner[s] = g
+            cells[g] = [s]
+            frontier[g] = [s]
+        done: List[List[int]] = []
+        while len(frontier) > 1:
+            for g in list(frontier):
+                if g not in frontier:
+                    continue  # bu turda başka gruba katıldı
+                nxt: List[int] = []
+                for u in frontier[g]:
+                    for v in adj[u]:
+                        if v == block or label[v] != lab:
+                            continue
+                        o = owner.get(v)
+                        if o is None:
+                            owner[v] = g
+                            cells[g].append(v)
+                            nxt.append(v)
+                            continue
+                        r = find(o)
+                        if r != g and r in frontier:
+                            # Buluştular: küçük grubu büyüğe kat
+                            parent[r] = g
+                            cells[g].extend(cells.pop(r))
+                            nxt.extend(frontier.pop(r))
+                if nxt:
+                    frontier[g] = nxt
+                else:
+                    del frontier[g]
+                    done.append(cells.pop(g))
+                if len(frontier) <= 1:
+                    break
+        if not frontier:
+            return done, 0
+        return done, self.sizes.get(lab, 0) - sum(len(p) for p in done) - (1 if label[block] == lab else 0)
@@ -0,0 +1,98 @@
+"""
+Snake AI — Per-Game Random Streams
+
+Every game owns its RNG (`game.rng`); nothing touches the global `random`
+module, so results per seed do not depend on how many games run, in which
+order, or on which thread/process.
+
+Kinds (`make_rng(seed, kind)`):
+- "mt": `random.Random(seed)` — the same Mersenne Twister sequence the
+  global `random.seed(seed)` gave before, so old seeds replay unchanged.
+- "counter": `CounterRandom(seed)` — draw k is splitmix64(seed, k), a pure
+  function of (seed, k). Each `choice()` uses exactly one draw, so food #k
+  is picked by draw k and can be recomputed without replaying the stream;
+  the state is just (seed, counter). Non-int seeds are hashed
+  deterministically (sha512 for str/bytes, as `random.Random` does), so
+  they give the same stream in every process.
+
+"""
+
+import hashlib
+import random
+from typing import Optional, Sequence, Any, Tuple
+
+KINDS = ("mt", "counter")
+
+_MASK = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+
+def splitmix64(seed: int, k: int) -> int:
+    """(seed, k) -> 64-bit; k. sayacın değeri doğrudan hesaplanır."""
+    z = (seed + (k + 1) * _GOLDEN) & _MASK
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+    return z ^ (z >> 31)
+
+class CounterRandom(random.Random):
+    """Sayaç tabanlı akış; `random.Random` arayüzünün geri kalanı random()/getrandbits() üstünden çalışır."""
+
+    def __init__(self, seed: Optional[int] = 0):
+        self.counter = 0
+        self.key = 0
+        super().__init__(seed)
+
+    def seed(self, a: Any = None, version: int = 2) -> None:
+        if a is None:
+            a = random.SystemRandom().getrandbits(64)
+        elif isinstance(a, (str, bytes, bytearray)):
+            # random.Random gibi sha512; hash() PYTHONHASHSEED ile süreçten sürece değişir
+            if isinstance(a, str):
+                a = a.encode()
+            a = int.from_bytes(hashlib.sha512(a).digest(), "big")
+        elif isinstance(a, float):
+            a = hash(a)  # float hash'i sabit (tohumdan bağımsız)
+        elif not isinstance(a, int):
+            raise TypeError("seed must be one of: None, int, float, str, bytes, and bytearray")
+        self.key = a & _MASK
+        self.counter = 0
+
+    def at(self, k: int) -> int:
+        return splitmix64(self.key, k)
+
+    def _next(self) -> int:
+        value = splitmix64(self.key, self.counter)
+        self.counter += 1
+        return value
+
+    def random(self) -> float:
+        return (self._next() >> 11) * (1.0 / (1 << 53))
+
+    def getrandbits(self, k: int) -> int:
+        if k <= 64:
+            return self._next() >> (64 - k) if k else 0
+        out = 0
+        for shift in range(0, k, 64):
+            out |= self._next() << shift
+        return out & ((1 << k) - 1)
+
+    def choice(self, seq: Sequence[Any]) -> Any:
+        # Tek çekiliş: (değer * n) >> 64, reddetme döngüsü yok
+        if not seq:
+            raise IndexError("cannot choose from an empty sequence")
+        return seq[(self._next() * len(seq)) >> 64]
+
+    def getstate(self) -> Tuple[str, int, int]:
+        return ("counter", self.key, self.counter)
+
+    def setstate(self, state: Tuple[str, int, int]) -> None:
+        _, self.key, self.counter = state
+
+def make_rng(seed: Optional[int] = None, kind: str = "mt") -> random.Random:
+    if kind == "mt":
+        return random.Random(seed)
+    if kind == "counter":
+        return CounterRandom(seed)
+    raise ValueError(f"unknown rng kind {kind!r}; choose from {KINDS}")
+
+def rng_kind(rng: random.Random) -> str:
+    return "counter" if isinstance(rng, CounterRandom) else "mt"
@@ -4,35 +4,136 @@ Snake AI — Algorithms Summary (updated 2025-11-05 12:18)
 This module implements **Breadth-First Search (BFS)** on a 4-neighborhood grid.
 - Purpose: find a shortest path from `start` to `goal` avoiding `blocked` cells.
 - Complexity (per call): **O(V+E) = O(m·n)** on an m×n grid (E≈4V).
-- Size agnostic: uses `grid.neighbors()` which consults `config.COLS/ROWS`.
+- Size agnostic: runs on the `grid.Board` tables (flat cell indices) of the
+  board passed in; `bfs_path` converts (x,y) in and out.
+
+`bfs_indices` / `reachable` are the index-level cores: `blocked` is a
+bytearray over cell indices (nonzero = wall), e.g. `SnakeBody.occ`.
+`flood_fill` labels one connected region in place (for region queries).
+All report call count and expanded nodes to `instrument` when profiling.
+
+Backends: `set_backend("numpy")` routes `bfs_path` (and everything built on
+it, including `simulate.TickContext`) to the vectorized `search_np`
+wavefront implementation; "python" is the default. `search_np` (and numpy)
+is imported only when that backend is selected.
 
 """
 
-from collections import deque
-from typing import Optional, Set, Tuple, List
+from typing import Optional, Set, Tuple, List, Sequence
 
-from grid import neighbors
+import instrument
+from grid import Board, DEFAULT_BOARD
 
 Pos = Tuple[int, int]
 
-def bfs_path(start: Pos, goal: Optional[Pos], blocked: Set[Pos]) -> Optional[List[Pos]]:
+BACKENDS = ("python", "numpy")
+_backend = "python"
+
+def set_backend(name: str) -> None:
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"unknown search backend {name!r}; choose from {BACKENDS}")
+    if name == "numpy":
+        import search_np  # numpy yalnızca bu backend seçilince yüklenir (~130ms)
+        search_np.require_numpy()
+    _backend = name
+
+def get_backend() -> str:
+    return _backend
+
+def _report(nodes: int) -> None:
+    if instrument.ACTIVE is not None:
+        instrument.ACTIVE.bfs(nodes)
+
+def bfs_indices(nbrs: Sequence[Tuple[int, ...]], start: int, goal: int,
+                blocked: bytearray) -> Optional[List[int]]:
+    """start->goal en kısa yol (indeks listesi). `blocked` değiştirilmez."""
+    if start == goal:
+        return [start]
+    seen = bytearray(blocked)
+    seen[start] = 1
+    came = {start: -1}
+    frontier = [start]
+    expanded = 0
+    while frontier:
+        expanded += len(frontier)
+        nxt = []
+        for u in frontier:
+            for v in nbrs[u]:
+                if seen[v]:
+                    continue
+                seen[v] = 1
+                came[v] = u
+                if v == goal:
+                    path = [v]
+                    while came[path[-1]] != -1:
+                        path.append(came[path[-1]])
+                    path.reverse()
+                    _report(expanded)
+                    return path
+                nxt.append(v)
+        frontier = nxt
+    _report(expanded)
+    return None
+
+def reachable(nbrs: Sequence[Tuple[int, ...]], start: int, goal: int, blocked: bytearray) -> bool:
+    """start->goal yolu var mı? Yol kurmadığı için bfs_indices'ten ucuz."""
+    if start == goal:
+        return True
+    seen = bytearray(blocked)
+    seen[start] = 1
+    frontier = [start]
+    expanded = 0
+    while frontier:
+        expanded += len(frontier)
+        nxt = []
+        for u in frontier:
+            for v in nbrs[u]:
+                if seen[v]:
+                    continue
+                if v == goal:
+                    _report(expanded)
+                    return True
+                seen[v] = 1
+                nxt.append(v)
+        frontier = nxt
+    _report(expanded)
+    return False
+
+def flood_fill(nbrs: Sequence[Tuple[int, ...]], start: int, seen: bytearray,
+               labels: List[int], label: int) -> int:
+    """start'ın bölgesini `label` ile etiketle; bölge boyutunu döndür. `seen` yerinde güncellenir."""
+    seen[start] = 1
+    labels[start] = label
+    frontier = [start]
+    size = 0
+    while frontier:
+        size += len(frontier)
+        nxt = []
+        for u in frontier:
+            for v in nbrs[u]:
+                if not seen[v]:
+                    seen[v] = 1
+                    labels[v] = label
+                    nxt.append(v)
+        frontier = nxt
+    _report(size)
+    return size
+
+def bfs_path(start: Pos, goal: Optional[Pos], blocked: Set[Pos],
+             board: Board = DEFAULT_BOARD) -> Optional[List[Pos]]:
     """start->goal en kısa yol (blocked: set[(x,y)])"""
+    if _backend == "numpy":
+        import search_np
+        return search_np.bfs_path(start, goal, blocked, board)
     if goal is None or start == goal:
         return [start]
-    q = deque([start])
-    came = {start: None}
-    while q:
-        u = q.popleft()
-        for v in neighbors(u):
-            if v in blocked or v in came:
-                continue
-            came[v] = u
-            if v == goal:
-                path = [v]
-                while path[-1] is not None:
-                    path.append(came[path[-1]])
-                path.pop()
-                path.reverse()
-                return path
-            q.append(v)
-    return None
+    if not board.in_bounds(goal):
+        return None
+    cols, rows = board.cols, board.rows
+    mask = bytearray(board.cells)
+    for x, y in blocked:
+        if 0 <= x < cols and 0 <= y < rows:
+            mask[y * cols + x] = 1
+    path = bfs_indices(board.nbrs, start[1] * cols + start[0], goal[1] * cols + goal[0], mask)
+    return None if path is None else [board.positions[i] for i in path]
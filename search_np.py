@@ -0,0 +1,166 @@
+"""
+Snake AI — NumPy Search Backend (optional)
+
+Alternative to the pure-Python BFS in `search`: distance fields are grown
+as wavefronts over a boolean free-cell grid, one whole-array step per BFS
+level instead of one Python iteration per cell. Grids may carry leading
+batch axes, so several boards (e.g. the four candidate moves of
+`safe_neighbors`) expand in a single pass.
+
+Selected at runtime with `search.set_backend("numpy")`; `numpy` is only
+needed when this backend is used. Paths are shortest paths like the Python
+backend's, but ties may be broken differently.
+
+Cost is O(cells) per BFS level, so it wins on large open boards and loses
+on long single-file corridors (many levels, few cells each).
+
+"""
+
+from typing import Optional, Set, Tuple, List, Sequence
+
+import instrument
+from grid import Board
+
+try:
+    import numpy as np
+except ImportError:  # numpy opsiyonel; yalnızca bu backend seçilince gerekir
+    np = None
+
+Pos = Tuple[int, int]
+
+def _report(visited: "np.ndarray") -> None:
+    # instrument için: batch başına bir BFS, düğüm = ziyaret edilen hücreler
+    if instrument.ACTIVE is not None:
+        for b in range(len(visited)):
+            instrument.ACTIVE.bfs(int(visited[b].sum()))
+
+def require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("the numpy search backend needs numpy (pip install numpy)")
+
+def free_grid(board: Board, blocked: bytearray) -> "np.ndarray":
+    """Index tabanlı engel maskesini (rows, cols) boolean boş-hücre ızgarasına çevir."""
+    return np.frombuffer(blocked, dtype=np.uint8).reshape(board.rows, board.cols) == 0
+
+def _spread(front: "np.ndarray") -> "np.ndarray":
+    """Her hücreyi 4 komşusuna yay (son iki eksen y, x)."""
+    out = np.zeros_like(front)
+    out[..., 1:, :] |= front[..., :-1, :]
+    out[..., :-1, :] |= front[..., 1:, :]
+    out[..., :, 1:] |= front[..., :, :-1]
+    out[..., :, :-1] |= front[..., :, 1:]
+    return out
+
+def distance_field(free: "np.ndarray", sources: "np.ndarray",
+                   stop: Optional["np.ndarray"] = None) -> "np.ndarray":
+    """
+    Kaynaklardan BFS mesafesi (-1 = ulaşılamaz). Kaynaklar engelli olabilir
+    (ör. baş). `stop` verilirse tüm batch'lerde stop hücresine ulaşınca durur.
+    """
+    dist = np.full(free.shape, -1, dtype=np.int32)
+    dist[sources] = 0
+    visited = sources.copy()
+    front = sources.copy()
+    d = 0
+    while front.any():
+        if stop is not None and (visited & stop).reshape(len(stop), -1).any(axis=1).all():
+            break
+        d += 1
+        front = _spread(front) & free & ~visited
+        visited |= front
+        dist[front] = d
+    _report(visited)
+    return dist
+
+def reach(free: "np.ndarray", sources: "np.ndarray", targets: "np.ndarray") -> "np.ndarray":
+    """Batch başına: kaynaklardan hedef hücreye yol var mı? (bool dizi, batch boyu)"""
+    visited = sources.copy()
+    front = sources.copy()
+    flat = lambda a: a.reshape(len(a), -1)
+    done = flat(visited & targets).any(axis=1)
+    while not done.all() and front.any():
+        front = _spread(front) & free & ~visited
+        visited |= front
+        done |= flat(visited & targets).any(axis=1)
+    _report(visited)
+    return done
+
+def bfs_path(start: Pos, goal: Optional[Pos], blocked: Set[Pos], board: Board) -> Optional[List[Pos]]:
+    """search.bfs_path ile aynı sözleşme; mesafe alanını geriye yürüyerek yol kurar."""
+    if goal is None or start == goal:
+        return [start]
+    if not board.in_bounds(goal):
+        return None
+    free = np.ones((board.rows, board.cols), dtype=bool)
+    for x, y in blocked:
+        if board.in_bounds((x, y)):
+            free[y, x] = False
+    src = np.zeros_like(free)
+    src[start[1], start[0]] = True
+    tgt = np.zeros_like(free)
+    tgt[goal[1], goal[0]] = True
+    dist = distance_field(free[None], src[None], tgt[None])[0]
+    return walk_back(dist, goal, board)
+
+def walk_back(dist: "np.ndarray", goal: Pos, board: Board) -> Optional[List[Pos]]:
+    """dist alanında goal'dan 0'a inerek yol (grid.neighbors sırasıyla eşitlik bozulur)."""
+    d = int(dist[goal[1], goal[0]])
+    if d < 0:
+        return None
+    path = [goal]
+    cur = goal
+    while d > 0:
+        d -= 1
+        for nx, ny in board.neighbors(cur):
+            if dist[ny, nx] == d:
+                cur = (nx, ny)
+                break
+        path.append(cur)
+    path.reverse()
+    return path
+
+def moves_reach_goal(board: Board, occ: bytearray, moves: Sequence[Tuple[int, int, int]]) -> List[bool]:
+    """
+    Birden çok tek-adım simülasyonunu tek geçişte değerlendir.
+    moves: (yeni_baş, boşalan_hücre veya -1, hedef) indeksleri; hücre maskesi occ
+    (sayaç), hedef her batch'te serbest bırakılır.
+    """
+    if not moves:
+        return []
+    k = len(moves)
+    base = free_grid(board, occ)
+    free = np.repeat(base[None], k, axis=0)
+    src = np.zeros_like(free)
+    tgt = np.zeros_like(free)
+    cols = board.cols
+    for b, (head, vacated, goal) in enumerate(moves):
+        hy, hx = divmod(head, cols)
+        free[b, hy, hx] = False
+        src[b, hy, hx] = True
+        if vacated >= 0:
+            vy, vx = divmod(vacated, cols)
+            free[b, vy, vx] = True
+        gy, gx = divmod(goal, cols)
+        free[b, gy, gx] = True
+        tgt[b, gy, gx] = True
+    return [bool(v) for v in reach(free, src, tgt)]
+
+def path_on_mask(board: Board, blocked: bytearray, start: int, goal: int) -> Optional[List[Pos]]:
+    """search.bfs_indices karşılığı: engel maskesi üstünde start->goal yolu, (x,y) listesi."""
+    free = free_grid(board, blocked)
+    src = np.zeros_like(free)
+    tgt = np.zeros_like(free)
+    src.flat[start] = True
+    tgt.flat[goal] = True
+    dist = distance_field(free[None], src[None], tgt[None])[0]
+    return walk_back(dist, board.pos(goal), board)
+
+def connected_on_mask(board: Board, blocked: bytearray, a: int, b: int) -> bool:
+    """a'dan b'ye engel maskesinde yol var mı? (b serbest bırakılır)"""
+    free = free_grid(board, blocked).copy()
+    free.flat[b] = True
+    src = np.zeros_like(free)
+    tgt = np.zeros_like(free)
+    src.flat[a] = True
+    tgt.flat[b] = True
+    return bool(reach(free[None], src[None], tgt[None])[0])
@@ -1,67 +1,241 @@
-from collections import deque
-from typing import Tuple, Deque, List, Optional, Set
+from typing import Tuple, List, Optional, Set, Sequence
 
-from grid import in_bounds, neighbors
-from search import bfs_path
+from grid import Board, DEFAULT_BOARD
+import search
+from search import bfs_path, bfs_indices, flood_fill, reachable
+from regions import Regions
+from state import SnakeBody
 
 Pos = Tuple[int, int]
 
-def connected(a: Pos, b: Pos, blocked: Set[Pos]) -> bool:
-    return bfs_path(a, b, blocked) is not None
+def connected(a: Pos, b: Pos, blocked: Set[Pos], board: Board = DEFAULT_BOARD) -> bool:
+    return bfs_path(a, b, blocked, board) is not None
 
 def simulate_one_step_and_safe(game, move: Pos) -> bool:
     """ move'u atarsam bir sonraki anda head->tail yolu var mı? """
-    snake: Deque[Pos] = deque(game.snake)
+    snake: SnakeBody = game.snake
     food: Optional[Pos] = game.food
     tail = snake[-1]
     will_eat = (food is not None and move == food)
 
-    if not in_bounds(move):
+    if not snake.in_bounds(move):
         return False
     if (move in snake) and (move != tail or will_eat):
         return False
 
+    # Kopya yok: hamleyi gövdeye uygula, kontrol et, geri al (hepsi O(1)).
+    # Kuyruk önce atılır ki tahtayı dolduran yılanda da halka taşmasın.
+    popped = None if will_eat else snake.pop_tail()
     snake.appendleft(move)
-    if not will_eat:
-        snake.pop()
-
-    head = snake[0]
-    tail = snake[-1]
-    blocked = set(snake)
-    if tail in blocked:
-        blocked.remove(tail)
-    return bfs_path(head, tail, blocked) is not None
+    try:
+        return snake.tail_reachable()
+    finally:
+        snake.pop_head()
+        if popped is not None:
+            snake.push_tail(popped)
 
 def safe_neighbors(game) -> List[Pos]:
-    head = game.snake[0]
+    snake: SnakeBody = game.snake
     cands: List[Pos] = []
-    for nb in neighbors(head):
+    for j in snake.adj[snake.head_idx]:
+        nb = snake.cell_pos[j]
         if simulate_one_step_and_safe(game, nb):
             cands.append(nb)
     return cands
 
+def path_safe(snake: SnakeBody, path: Sequence[int], food: int = -1) -> bool:
+    """
+    `path` (baş hariç hücre indeksleri) yürünürse, yol bitince baş -> kuyruk
+    yolu var mı? Gövde kopyalanmaz ve adım başına gövde taranmaz: boşalma
+    zamanı (`SnakeBody.vacates_in`) ile çözülür.
+
+    Yemek yenen adım hariç her adım kuyruğu bir düşürür; `pops` o ana kadar
+    düşen parça sayısı. Eski gövde hücresi c'ye vacates_in(c) <= pops + 1
+    iken (boş ya da o anki kuyruk) basılabilir; yolun s. hücresi ise
+    n + s - 1 düşüşte boşalır. Yol bitince gövde maskesi occ kopyası + O(k)
+    düzeltmeyle kurulur. Toplam O(k + hücre).
+    """
+    k = len(path)
+    if not k:
+        return snake.tail_reachable()
+    n = len(snake)
+    cap = len(snake.occ)
+    placed = {}  # yol hücresi -> boşalacağı düşüş sayısı
+    pops = 0
+    ate = False
+    for t in range(1, k + 1):
+        c = path[t - 1]
+        if not 0 <= c < cap:
+            return False
+        free_at = placed.get(c)
+        if free_at is None:
+            free_at = snake.vacates_in(c)
+        if free_at > pops + 1:
+            return False  # hücre dolu ve kuyruk değil
+        if not ate and c == food:
+            ate = True
+        else:
+            pops += 1
+        placed[c] = n + t
+
+    # Yol sonundaki gövde: eski gövdenin son n - pops parçası + yolun son hücreleri
+    mask = bytearray(snake.occ)
+    for m in range(min(pops, n)):
+        mask[snake.cell_at(n - 1 - m)] -= 1
+    for s in range(max(1, pops - n + 1), k + 1):
+        mask[path[s - 1]] += 1
+    tail = snake.cell_at(n - 1 - pops) if pops < n else path[pops - n]
+    mask[tail] = 0
+    return reachable(snake.adj, path[-1], tail, mask)
+
 def simulate_path_and_check_safety(game, path: List[Pos]) -> bool:
     """ Food'a giden yolu simüle et; yemden sonra head->tail mümkün mü? """
-    snake: Deque[Pos] = deque(game.snake)
-    food: Optional[Pos] = game.food
-
+    snake: SnakeBody = game.snake
     if path and path[0] == snake[0]:
         path = path[1:]
-
-    for step_cell in path:
-        if not in_bounds(step_cell):
+    cols, rows = snake.cols, snake.rows
+    steps: List[int] = []
+    for x, y in path:
+        if not (0 <= x < cols and 0 <= y < rows):
             return False
-        will_eat = (food is not None and step_cell == food)
-        if step_cell in snake and step_cell != snake[-1]:
+        steps.append(y * cols + x)
+    food = snake.index(game.food) if game.food is not None else -1
+    return path_safe(snake, steps, food)
+
+class TickContext:
+    """
+    Tek bir decide çağrısının arama sonuçları; aşamalar aynı BFS'i tekrar koşmaz.
+
+    Bölgeler "boş hücreler + kuyruk" grafında tembel etiketlenir. Basit bir yol
+    başladığı hücreye dönmediği için tek adımlık hamle simülasyonları bu tabana
+    indirgenir (yerel değişiklik: yeni baş + boşalan kuyruk):
+    - yiyen hamle nb güvenli  <=>  bölge(nb) == bölge(kuyruk)
+    - yemeyen hamle nb güvenli <=> kuyruktan bir önceki parçanın bir komşusu bölge(nb)'de
+    Böylece `connected(food, tail)` ve dört `simulate_one_step_and_safe` BFS'i
+    birkaç flood fill'e, `bfs_path(head, food)` ise doğrudan occupancy üstünde
+    tek bir BFS'e iner. Sonuçlar eski fonksiyonlarla birebir aynıdır.
+
+    Oyun `regions.Regions` tutuyorsa (`game.regions`, step_once günceller)
+    bölge soruları flood fill yerine ondan O(1) cevaplanır; `move_area` /
+    `move_cutoff` hamle sonrası kalan en büyük boş alanı / kopan cebi verir
+    (yapı yoksa burada kurulur).
+
+    numpy backend'inde aynı sorular `search_np` ile cevaplanır; dört aday
+    hamle tek bir batch geçişinde değerlendirilir.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.snake: SnakeBody = game.snake
+        self.numpy = search.get_backend() == "numpy"
+        self.nbrs = self.snake.adj
+        self.head = self.snake.head_idx
+        self.tail = self.snake.tail_idx
+        self._seen: Optional[bytearray] = None
+        self._labels: Optional[List[int]] = None
+        self.region_size: List[int] = [0]  # etiket -> bölge boyutu (0 = gövde)
+        self._safe: Optional[List[Pos]] = None
+        regions = getattr(game, "regions", None)
+        # Planlayıcı gölgesi / kopyalar kendi gövdesini taşır: yalnızca eşleşen yapı kullanılır
+        self.regions: Optional[Regions] = regions if regions is not None and regions.snake is self.snake else None
+
+    def region(self, i: int) -> int:
+        """i hücresinin bölge etiketi; gövde hücreleri (kuyruk hariç) için 0."""
+        if self.regions is not None:
+            return self.regions.group(i)
+        if self._labels is None:
+            self._labels = [0] * len(self.nbrs)
+            self._seen = bytearray(self.snake.occ)
+            self._seen[self.tail] = 0
+        if self._labels[i] or self._seen[i]:
+            return self._labels[i]
+        label = len(self.region_size)
+        self.region_size.append(flood_fill(self.nbrs, i, self._seen, self._labels, label))
+        return label
+
+    def _regions(self) -> Regions:
+        if self.regions is None:
+            self.regions = Regions(self.snake)
+        return self.regions
+
+    def move_area(self, move: Pos) -> int:
+        """move'a girince kalan en büyük boş parça."""
+        return self._regions().move_area(self.snake.index(move))
+
+    def move_cutoff(self, move: Pos) -> int:
+        """move'un bölgesinden koparıp ulaşılmaz bıraktığı boş hücre sayısı (cep)."""
+        return self._regions().move_cutoff(self.snake.index(move))
+
+    def connected(self, a: Pos, b: Pos) -> bool:
+        """a ile b kuyruk dışındaki gövdeye değmeden birleşiyor mu?"""
+        if self.numpy:
+            import search_np  # set_backend("numpy") yükledi
+            blocked = bytearray(self.snake.occ)
+            blocked[self.tail] = 0
+            return search_np.connected_on_mask(self.snake.board, blocked,
+                                               self.snake.index(a), self.snake.index(b))
+        ra = self.region(self.snake.index(a))
+        return ra != 0 and ra == self.region(self.snake.index(b))
+
+    def path_to(self, goal: Optional[Pos]) -> Optional[List[Pos]]:
+        """Baştan goal'a en kısa yol, tüm gövde engel (bfs_path(head, goal, set(snake)) ile aynı)."""
+        snake = self.snake
+        if goal is None or goal == snake[0]:
+            return [snake[0]]
+        if not snake.in_bounds(goal):
+            return None
+        if self.numpy:
+            import search_np
+            return search_np.path_on_mask(snake.board, snake.occ, self.head, snake.index(goal))
+        path = bfs_indices(self.nbrs, self.head, snake.index(goal), snake.occ)
+        return None if path is None else [snake.cell_pos[i] for i in path]
+
+    def _move_safe(self, j: int) -> bool:
+        snake = self.snake
+        food = self.game.food
+        will_eat = food is not None and j == snake.index(food)
+        if snake.occ[j] and (j != self.tail or will_eat):
             return False
-        snake.appendleft(step_cell)
         if will_eat:
-            food = None
-        else:
-            snake.pop()
+            return self.region(j) == self.region(self.tail)
+        if j == self.tail:
+            return True  # yeni kuyruk yeni başa komşu
+        r = self.region(j)
+        return any(self.region(w) == r for w in self.nbrs[snake.cell_at(-2)])
 
-    head = snake[0]
-    tail = snake[-1]
-    blocked = set(snake)
-    blocked.remove(tail)
-    return bfs_path(head, tail, blocked) is not None
+    def safe_neighbors(self) -> List[Pos]:
+        """simulate.safe_neighbors ile aynı liste (aynı sıra); her çağrı kopya döner."""
+        if self._safe is None:
+            if len(self.snake) < 2:
+                self._safe = safe_neighbors(self.game)
+            elif self.numpy:
+                self._safe = self._safe_neighbors_batched()
+            else:
+                cell_pos = self.snake.cell_pos
+                self._safe = [cell_pos[j] for j in self.nbrs[self.head] if self._move_safe(j)]
+        return list(self._safe)
+
+    def _safe_neighbors_batched(self) -> List[Pos]:
+        import search_np
+        snake = self.snake
+        food = self.game.food
+        food_idx = snake.index(food) if food is not None else -1
+        before_tail = snake.cell_at(-2)
+        verdict = {}
+        batch: List[Tuple[int, int, int]] = []
+        order: List[int] = []
+        for j in self.nbrs[self.head]:
+            will_eat = j == food_idx
+            if snake.occ[j] and (j != self.tail or will_eat):
+                verdict[j] = False
+            elif will_eat:
+                batch.append((j, -1, self.tail))
+                order.append(j)
+            elif j == self.tail:
+                verdict[j] = True
+            else:
+                batch.append((j, self.tail, before_tail))
+                order.append(j)
+        for j, ok in zip(order, search_np.moves_reach_goal(snake.board, snake.occ, batch)):
+            verdict[j] = ok
+        return [snake.cell_pos[j] for j in self.nbrs[self.head] if verdict[j]]
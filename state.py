@@ -0,0 +1,302 @@
+"""
+Snake AI — Compact Game State
+
+`SnakeBody` replaces the `deque[(x,y)]` snake. Cells are stored as flat
+indices (i = y*cols + x) in a fixed-size ring buffer, and a bytearray
+occupancy mask mirrors the body so `pos in snake` is O(1) instead of a
+deque scan. Head push / tail pop update both in O(1). The deque API the
+rest of the code relies on (`snake[0]`, `snake[-1]`, `len`, iteration,
+`appendleft`, `pop`) is kept, so callers and `ui.draw_snake` work unchanged.
+
+The mask holds per-cell counts, not flags: when the head steps onto the
+cell the tail is leaving, the cell is briefly counted twice and the
+following `pop()` leaves it occupied.
+
+`stamp[i]` records when cell i entered the body (head pushes count up, tail
+pushes count down), so `vacates_in(i)` — how many tail pops until i is free
+— is O(1). Path simulations use it instead of copying the body. Stamps along
+the body must stay consecutive, so `pop_head` is the exact inverse of
+`push_head` (it takes the sequence number back) and in-place apply/undo
+leaves no gap. `check()` verifies that `vacates_in` equals the ring distance
+to the tail; `python state.py` runs it on seeded games around every
+apply/undo the search code does.
+
+`FreeCells` is the complementary pool of empty cells (swap-remove array plus
+index map) that the game updates on every move, so food spawning samples a
+uniform empty cell in O(1) instead of rebuilding the empty set.
+
+Neighbor lookups go through the body's `grid.Board` tables (precomputed
+cell-index adjacency) instead of `in_bounds`/`neighbors`.
+
+"""
+
+import random
+from typing import Tuple, List, Iterable, Iterator, Optional
+
+from grid import Board
+from search import reachable
+
+Pos = Tuple[int, int]
+
+class SnakeBody:
+    __slots__ = ("board", "cols", "rows", "adj", "cell_pos", "occ", "stamp",
+                 "_buf", "_cap", "_head", "_len", "_seq")
+
+    def __init__(self, board: Board, cells: Iterable[Pos] = ()):
+        self.board = board
+        self.cols = board.cols
+        self.rows = board.rows
+        self.adj = board.nbrs
+        self.cell_pos = board.positions
+        self._cap = board.cells
+        self.occ = bytearray(self._cap)
+        self.stamp = [0] * self._cap  # hücrenin gövdeye giriş sırası
+        self._buf = [0] * self._cap
+        self._head = 0
+        self._len = 0
+        self._seq = 0
+        for p in cells:  # baştan kuyruğa
+            self.append(p)
+
+    # ---- indeks <-> (x,y) ----
+    def index(self, pos: Pos) -> int:
+        return pos[1] * self.cols + pos[0]
+
+    def pos(self, i: int) -> Pos:
+        return self.cell_pos[i]
+
+    def in_bounds(self, pos: Pos) -> bool:
+        x, y = pos
+        return 0 <= x < self.cols and 0 <= y < self.rows
+
+    # ---- deque uyumlu arayüz ----
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Pos]:
+        cell_pos = self.cell_pos
+        return iter([cell_pos[i] for i in self.indices()])
+
+    def __getitem__(self, k: int) -> Pos:
+        if k < 0:
+            k += self._len
+        if not 0 <= k < self._len:
+            raise IndexError("snake index out of range")
+        return self.pos(self._buf[(self._head + k) % self._cap])
+
+    def __contains__(self, pos) -> bool:
+        x, y = pos
+        return 0 <= x < self.cols and 0 <= y < self.rows and self.occ[y * self.cols + x] > 0
+
+    def __repr__(self) -> str:
+        return f"SnakeBody({self.cols}x{self.rows}, {list(self)!r})"
+
+    def appendleft(self, pos: Pos) -> None:
+        self.push_head(self.index(pos))
+
+    def append(self, pos: Pos) -> None:
+        self.push_tail(self.index(pos))
+
+    def pop(self) -> Pos:
+        return self.pos(self.pop_tail())
+
+    def popleft(self) -> Pos:
+        return self.pos(self.pop_head())
+
+    # ---- indeks tabanlı O(1) işlemler ----
+    def indices(self) -> List[int]:
+        """Gövde hücre indeksleri, baştan kuyruğa."""
+        h, end = self._head, self._head + self._len
+        if end <= self._cap:
+            return self._buf[h:end]
+        return self._buf[h:] + self._buf[:end - self._cap]
+
+    def cell_at(self, k: int) -> int:
+        """k. gövde parçasının hücre indeksi (0 = baş, -1 = kuyruk)."""
+        if k < 0:
+            k += self._len
+        return self._buf[(self._head + k) % self._cap]
+
+    @property
+    def head_idx(self) -> int:
+        return self._buf[self._head]
+
+    @property
+    def tail_idx(self) -> int:
+        return self._buf[(self._head + self._len - 1) % self._cap]
+
+    def push_head(self, i: int) -> None:
+        if self._len == self._cap:
+            raise IndexError("snake already fills the board")
+        self._head = (self._head - 1) % self._cap
+        self._buf[self._head] = i
+        self.occ[i] += 1
+        self.stamp[i] = self._seq
+        self._seq += 1
+        self._len += 1
+
+    def push_tail(self, i: int) -> None:
+        if self._len == self._cap:
+            raise IndexError("snake already fills the board")
+        if self._len:
+            self.stamp[i] = self.stamp[self.tail_idx] - 1
+        else:
+            self.stamp[i] = self._seq
+            self._seq += 1
+        self._buf[(self._head + self._len) % self._cap] = i
+        self.occ[i] += 1
+        self._len += 1
+
+    def pop_tail(self) -> int:
+        if not self._len:
+            raise IndexError("pop from an empty snake")
+        self._len -= 1
+        i = self._buf[(self._head + self._len) % self._cap]
+        self.occ[i] -= 1
+        return i
+
+    def pop_head(self) -> int:
+        if not self._len:
+            raise IndexError("pop from an empty snake")
+        i = self._buf[self._head]
+        self._head = (self._head + 1) % self._cap
+        self._len -= 1
+        self.occ[i] -= 1
+        self._seq -= 1  # push_head'in tam tersi: damgalar ardışık kalsın
+        return i
+
+    def copy(self) -> "SnakeBody":
+        other = SnakeBody.__new__(SnakeBody)
+        other.board, other.cols, other.rows = self.board, self.cols, self.rows
+        other.adj, other.cell_pos = self.adj, self.cell_pos
+        other._cap, other._head, other._len, other._seq = self._cap, self._head, self._len, self._seq
+        other.occ = bytearray(self.occ)
+        other.stamp = self.stamp[:]
+        other._buf = self._buf[:]
+        return other
+
+    def vacates_in(self, i: int) -> int:
+        """i hücresi kaç kuyruk düşüşünden sonra boşalır (boşsa 0, kuyruk 1)."""
+        if not self.occ[i]:
+            return 0
+        return self.stamp[i] - self.stamp[self.tail_idx] + 1
+
+    def check(self) -> None:
+        """Tutarlılık denetimi: occ sayıları gövdeyle, vacates_in halka mesafesiyle aynı mı? (AssertionError)"""
+        cells = self.indices()
+        counts = bytearray(self._cap)
+        for i in cells:
+            counts[i] += 1
+        assert counts == self.occ, "occupancy mask out of sync with the body"
+        n = len(cells)
+        for k, i in enumerate(cells):
+            if counts[i] == 1:
+                assert self.vacates_in(i) == n - k, f"vacates_in({i}) = {self.vacates_in(i)}, ring distance {n - k}"
+
+    def tail_reachable(self) -> bool:
+        """Baş -> kuyruk yolu var mı? Gövde duvar sayılır, kuyruk hücresi hariç."""
+        occ = self.occ
+        tail = self.tail_idx
+        count = occ[tail]
+        occ[tail] = 0
+        try:
+            return reachable(self.adj, self.head_idx, tail, occ)
+        finally:
+            occ[tail] = count
+
+class FreeCells:
+    """Boş hücre havuzu: `_cells` sıkışık dizi, `_where[i]` i'nin dizideki yeri (-1 = dolu)."""
+    __slots__ = ("_cells", "_where")
+
+    def __init__(self, board: Board, occupied: Iterable[int] = ()):
+        self._cells = list(range(board.cells))
+        self._where = list(range(board.cells))
+        for i in occupied:
+            self.discard(i)
+
+    @classmethod
+    def from_order(cls, board: Board, cells: Iterable[int]) -> "FreeCells":
+        """Havuzu tam bu sırayla kur (snapshot'tan; choice() sonuçları aynı kalsın)."""
+        pool = cls.__new__(cls)
+        pool._cells = list(cells)
+        pool._where = [-1] * board.cells
+        for k, i in enumerate(pool._cells):
+            pool._where[i] = k
+        return pool
+
+    def order(self) -> List[int]:
+        return self._cells[:]
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __contains__(self, i: int) -> bool:
+        return self._where[i] >= 0
+
+    def discard(self, i: int) -> None:
+        k = self._where[i]
+        if k < 0:
+            return
+        last = self._cells.pop()
+        if last != i:  # sondakini boşalan yere taşı
+            self._cells[k] = last
+            self._where[last] = k
+        self._where[i] = -1
+
+    def add(self, i: int) -> None:
+        if self._where[i] >= 0:
+            return
+        self._where[i] = len(self._cells)
+        self._cells.append(i)
+
+    def choice(self, rng: random.Random) -> Optional[int]:
+        """Düzgün dağılımlı rastgele boş hücre (O(1)); tahta doluysa None."""
+        return rng.choice(self._cells) if self._cells else None
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Tohumlu oyunlarda her tick yerinde uygula/geri al sonrası `SnakeBody.check()`."""
+    import argparse
+    from headless import HeadlessGame
+    from simulate import safe_neighbors
+
+    ap = argparse.ArgumentParser(description="Check SnakeBody stamps stay consistent across in-place apply/undo.")
+    ap.add_argument("--games", type=int, default=20)
+    ap.add_argument("--size", type=int, default=10)
+    ap.add_argument("--max-steps", type=int, default=2000)
+    args = ap.parse_args(argv)
+
+    rng = random.Random(0)
+    ticks = 0
+    for seed in range(args.games):
+        game = HeadlessGame(args.size, args.size, seed=seed)
+        while game.alive and not game.won and game.steps < args.max_steps:
+            snake = game.snake
+            safe_neighbors(game)  # simulate_one_step_and_safe: uygula / geri al
+            # Arama kodlarının yaptığı gibi iç içe rastgele adımlar, sonra hepsini geri al
+            undo = []
+            for _ in range(rng.randint(1, 8)):
+                grow = rng.random() < 0.2
+                tail = snake.tail_idx
+                moves = [j for j in snake.adj[snake.head_idx]
+                         if not snake.occ[j] or (j == tail and not grow and len(snake) > 1)]
+                if not moves or len(snake) == snake._cap:
+                    break
+                t = -1 if grow else snake.pop_tail()
+                snake.push_head(rng.choice(moves))
+                undo.append(t)
+                snake.check()
+            while undo:
+                t = undo.pop()
+                snake.pop_head()
+                if t >= 0:
+                    snake.push_tail(t)
+            snake.check()
+            game.logic_tick()
+            snake.check()
+            ticks += 1
+    print(f"{ticks} ticks checked over {args.games} games: ok")
+    return 0
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
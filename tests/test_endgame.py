@@ -0,0 +1,23 @@
+"""Endgame çözücüsü, küçük tahtalarda budamasız brute_force ile hamle hamle karşılaştırılır."""
+
+import re
+
+import pytest
+
+from endgame import Endgame, MAX_DEPTH, main
+from grid import get_board
+
+
+def test_matches_brute_force(capsys):
+    assert main(["--sizes", "3x3", "2x4", "3x4", "4x3", "--games", "12"]) == 0
+    checked, bad = map(int, re.search(r"(\d+) move values checked, (\d+) mismatches",
+                                      capsys.readouterr().out).groups())
+    assert checked > 100 and bad == 0
+
+
+def test_horizon_stays_under_recursion_cap():
+    board = get_board(10, 10)
+    solver = Endgame(board, max_empty=6)
+    assert (solver.max_empty + 1) * (solver.horizon + 1) <= MAX_DEPTH
+    with pytest.raises(ValueError):
+        Endgame(board, max_empty=6, horizon=MAX_DEPTH)
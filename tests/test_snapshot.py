@@ -0,0 +1,38 @@
+"""Snapshot/restore: geri yüklenen oyun aynı izi sürmeli (arama tabloları kopyalanmadan)."""
+
+import pickle
+
+import pytest
+
+from headless import HeadlessGame
+
+
+def trace(game, ticks):
+    out = []
+    for _ in range(ticks):
+        if not game.alive or game.won:
+            break
+        game.logic_tick()
+        out.append((game.snake.indices(), game.food, game.status, game.score))
+    return out
+
+
+@pytest.mark.parametrize("policy", ["heuristic", "lookahead"])
+@pytest.mark.parametrize("seed,at", [(0, 60), (1, 150), (3, 400)])
+def test_restored_trace_matches(policy, seed, at):
+    game = HeadlessGame(7, 7, seed=seed, policy=policy)
+    trace(game, at)
+    blob = pickle.dumps(game.snapshot())
+    expected = trace(game, 5000)
+
+    other = HeadlessGame(7, 7, seed=99, policy="heuristic")
+    other.restore(pickle.loads(blob))
+    assert trace(other, 5000) == expected
+
+
+def test_snapshot_leaves_search_tables_out():
+    game = HeadlessGame(10, 10, seed=5, policy="lookahead")
+    trace(game, 700)
+    assert game.policy.search.table
+    assert len(pickle.dumps(game.snapshot())) < 16 * 1024
+    assert not game.policy.search.table
@@ -0,0 +1,139 @@
+"""SnakeBody.vacates_in ve simulate.path_safe, düz bir deque gövdeyle karşılaştırılır."""
+
+import random
+from collections import deque
+
+import pytest
+
+from grid import get_board
+from headless import HeadlessGame
+from simulate import path_safe
+from state import SnakeBody
+
+
+def ref_vacates(body, i):
+    """deque gövde (baştan kuyruğa): i kaç kuyruk düşüşünden sonra boşalır."""
+    if i not in body:
+        return 0
+    return len(body) - list(body).index(i)
+
+
+def ref_path_safe(board, body, path, food):
+    """Gövdeyi deque üstünde yürüt; yol bitince baş -> kuyruk BFS'i (kuyruk hariç gövde duvar)."""
+    body = deque(body)
+    ate = False
+    for c in path:
+        if not 0 <= c < board.cells:
+            return False
+        if c in body and c != body[-1]:
+            return False
+        if not ate and c == food:
+            ate = True
+        else:
+            body.pop()
+        body.appendleft(c)
+    tail = body[-1]
+    walls = set(body)
+    walls.discard(tail)
+    seen = {body[0]}
+    frontier = [body[0]]
+    while frontier:
+        nxt = []
+        for u in frontier:
+            if u == tail:
+                return True
+            for v in board.nbrs[u]:
+                if v not in walls and v not in seen:
+                    seen.add(v)
+                    nxt.append(v)
+        frontier = nxt
+    return False
+
+
+def check_against(snake, body):
+    assert snake.indices() == list(body)
+    for i in range(len(snake.occ)):
+        if snake.occ[i] <= 1:
+            assert snake.vacates_in(i) == ref_vacates(body, i), i
+    snake.check()
+
+
+def test_vacates_in_after_pop_head_then_push_head():
+    board = get_board(5, 5)
+    snake = SnakeBody(board, [(2, 2), (1, 2), (0, 2)])
+    body = deque(snake.indices())
+    # pop_head + push_head (başka hücreye): damgalar boşluksuz kalmalı
+    body.popleft()
+    snake.pop_head()
+    check_against(snake, body)
+    j = board.index((1, 1))
+    body.appendleft(j)
+    snake.push_head(j)
+    check_against(snake, body)
+    # geri alınmış adım + ileri adım + kuyruk düşüşü
+    t = snake.pop_tail()
+    body.pop()
+    j = board.index((2, 1))
+    snake.push_head(j)
+    body.appendleft(j)
+    check_against(snake, body)
+    snake.pop_head()
+    body.popleft()
+    snake.push_tail(t)
+    body.append(t)
+    check_against(snake, body)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_vacates_in_random_push_pop(seed):
+    rng = random.Random(seed)
+    board = get_board(6, 5)
+    snake = SnakeBody(board, [(3, 2), (2, 2)])
+    body = deque(snake.indices())
+    for _ in range(2000):
+        op = rng.randrange(4)
+        if op == 0 and len(body) < board.cells:
+            moves = [j for j in board.nbrs[body[0]] if j not in body]
+            if moves:
+                j = rng.choice(moves)
+                snake.push_head(j)
+                body.appendleft(j)
+        elif op == 1 and len(body) < board.cells:
+            moves = [j for j in board.nbrs[body[-1]] if j not in body]
+            if moves:
+                j = rng.choice(moves)
+                snake.push_tail(j)
+                body.append(j)
+        elif op == 2 and len(body) > 1:
+            assert snake.pop_head() == body.popleft()
+        elif op == 3 and len(body) > 1:
+            assert snake.pop_tail() == body.pop()
+        check_against(snake, body)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_path_safe_matches_deque(seed):
+    rng = random.Random(seed)
+    game = HeadlessGame(7, 7, seed=seed)
+    board = game.board
+    checked = 0
+    while game.alive and not game.won and game.steps < 1500:
+        snake = game.snake
+        food = snake.index(game.food) if game.food is not None else -1
+        # Arama kodları gibi önce yerinde uygula / geri al; sonra yolları dene
+        t = snake.pop_tail()
+        moves = [j for j in snake.adj[snake.head_idx] if not snake.occ[j] and j != food]
+        if moves:
+            snake.push_head(rng.choice(moves))
+            snake.pop_head()
+        snake.push_tail(t)
+        for _ in range(3):
+            path, head = [], snake.head_idx
+            for _ in range(rng.randint(1, 2 * board.cols)):
+                head = rng.choice(board.nbrs[head])
+                path.append(head)
+            want = ref_path_safe(board, snake.indices(), path, food)
+            assert path_safe(snake, path, food) == want, (game.steps, path)
+            checked += 1
+        game.logic_tick()
+    assert checked > 100
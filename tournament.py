@@ -0,0 +1,189 @@
+"""
+Snake AI — Tournament Runner
+
+Fans out seeded headless episodes (`headless.run_episode`) across a
+`ProcessPoolExecutor` and aggregates them per (policy, board size, start length):
+win rate, score, steps to clear (mean / percentiles), causes of death and
+the histogram of `game.status` modes chosen by the policy.
+Per-game results can be streamed to a JSON-lines file as they arrive.
+Board size travels with each task, so one pool serves every size; `play()`
+runs any list of such tasks (used by `tune.py`).
+
+    python tournament.py --games 1000 --sizes 10x10 12x12 --policy heuristic hamilton --workers 8 --out runs.jsonl --record runs.snkr
+
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple, List, Dict, Any, Optional, Callable, Sequence
+
+from config import COLS, ROWS, START_LEN, POLICY
+from headless import max_start_len, run_episode
+import policy
+from rng import KINDS
+import search
+
+Size = Tuple[int, int]
+Result = Dict[str, Any]
+# (seed, cols, rows, start_len, max_steps, policy, options, record, rng)
+Task = Tuple[int, int, int, int, Optional[int], str, Dict[str, Any], bool, str]
+
+def _init_worker(backend: str) -> None:
+    search.set_backend(backend)
+
+def _play(task: Task) -> Result:
+    seed, cols, rows, start_len, max_steps, name, options, record, rng = task
+    return run_episode(seed, cols, rows, start_len=start_len, max_steps=max_steps,
+                       policy=name, policy_options=options, record=record, rng=rng)
+
+def parse_size(text: str) -> Size:
+    cols, _, rows = text.lower().partition("x")
+    try:
+        return int(cols), int(rows or cols)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"board size must look like 10x10, got {text!r}")
+
+def run_tournament(games: int, sizes: Sequence[Size], start_lens: Sequence[int],
+                   workers: Optional[int] = None, seed: int = 0,
+                   max_steps: Optional[int] = None,
+                   on_result: Optional[Callable[[Result], None]] = None,
+                   backend: str = "python",
+                   policies: Sequence[str] = (POLICY,),
+                   policy_options: Optional[Dict[str, Any]] = None,
+                   record: bool = False, rng: str = "mt") -> List[Result]:
+    """Her (politika, boyut, başlangıç uzunluğu) için aynı `games` tohumunu oynat."""
+    options = policy_options or {}
+    tasks = [(seed + i, cols, rows, start_len, max_steps, name, policy.scope_options(options, name), record, rng)
+             for name in policies for cols, rows in sizes
+             for start_len in start_lens for i in range(games)]
+    return play(tasks, workers, backend, on_result)
+
+def play(tasks: Sequence[Task], workers: Optional[int] = None, backend: str = "python",
+         on_result: Optional[Callable[[Result], None]] = None) -> List[Result]:
+    """Görevleri süreç havuzunda oynat; sonuçlar görev sırasıyla döner."""
+    workers = workers or os.cpu_count() or 1
+    # Küçük parçalar IPC maliyetini artırır, büyük parçalar son işçileri boşta bırakır
+    chunksize = max(1, len(tasks) // (workers * 8))
+    results: List[Result] = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(backend,)) as pool:
+        for res in pool.map(_play, tasks, chunksize=chunksize):
+            results.append(res)
+            if on_result is not None:
+                on_result(res)
+    return results
+
+def percentile(sorted_vals: Sequence[float], q: float) -> float:
+    """Nearest-rank yüzdelik; boş listede 0."""
+    if not sorted_vals:
+        return 0
+    k = max(0, min(len(sorted_vals) - 1, math.ceil(q / 100.0 * len(sorted_vals)) - 1))
+    return sorted_vals[k]
+
+def summarize(results: Sequence[Result]) -> Dict[str, Dict[str, Any]]:
+    groups: Dict[str, List[Result]] = {}
+    for r in results:
+        key = f"{r['policy']} {r['cols']}x{r['rows']} len{r['start_len']}"
+        groups.setdefault(key, []).append(r)
+
+    summary: Dict[str, Dict[str, Any]] = {}
+    for key, rs in groups.items():
+        n = len(rs)
+        clear_steps = sorted(r["steps"] for r in rs if r["won"])
+        causes = Counter(r["cause"] for r in rs if not r["won"])
+        modes: Counter = Counter()
+        for r in rs:
+            modes.update(r["modes"])
+        summary[key] = {
+            "games": n,
+            "win_rate": len(clear_steps) / n,
+            "mean_score": sum(r["score"] for r in rs) / n,
+            "mean_steps": sum(r["steps"] for r in rs) / n,
+            "clear_steps_mean": sum(clear_steps) / len(clear_steps) if clear_steps else 0,
+            "clear_steps_p50": percentile(clear_steps, 50),
+            "clear_steps_p90": percentile(clear_steps, 90),
+            "clear_steps_p99": percentile(clear_steps, 99),
+            "causes": dict(causes),
+            "modes": dict(modes.most_common()),
+        }
+    return summary
+
+def print_summary(summary: Dict[str, Dict[str, Any]], elapsed: float, out=sys.stdout) -> None:
+    total = sum(s["games"] for s in summary.values())
+    print(f"{total} games in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.1f} games/s)", file=out)
+    for key, s in summary.items():
+        print(f"\n[{key}] games={s['games']}  win={s['win_rate']:.1%}  "
+              f"score={s['mean_score']:.1f}  steps={s['mean_steps']:.0f}", file=out)
+        print(f"  steps to clear: mean={s['clear_steps_mean']:.0f}  p50={s['clear_steps_p50']}  "
+              f"p90={s['clear_steps_p90']}  p99={s['clear_steps_p99']}", file=out)
+        if s["causes"]:
+            print("  causes: " + ", ".join(f"{c}={n}" for c, n in s["causes"].items()), file=out)
+        total_moves = sum(s["modes"].values()) or 1
+        print("  modes:  " + ", ".join(f"{m}={n / total_moves:.1%}" for m, n in s["modes"].items()), file=out)
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Run many seeded headless Snake AI games in parallel.")
+    ap.add_argument("--games", type=int, default=100, help="games per board size and start length")
+    ap.add_argument("--sizes", type=parse_size, nargs="+", default=[(COLS, ROWS)], help="e.g. 10x10 20x20")
+    ap.add_argument("--start-len", type=int, nargs="+", default=[START_LEN], dest="start_lens")
+    ap.add_argument("--policy", nargs="+", choices=policy.available(), default=[POLICY],
+                    dest="policies", help="policies to compare on the same seeds")
+    ap.add_argument("--policy-opt", nargs="*", default=[], metavar="KEY=VALUE",
+                    help="constructor options, e.g. endgame_nodes=0 (all policies) or hamilton.shortcuts=false")
+    ap.add_argument("--workers", type=int, default=None, help="process count (default: all cores)")
+    ap.add_argument("--seed", type=int, default=0, help="first seed; game i uses seed+i")
+    ap.add_argument("--max-steps", type=int, default=None, help="per-game step cap (default: cells^2 * 2)")
+    ap.add_argument("--backend", choices=search.BACKENDS, default="python", help="search backend")
+    ap.add_argument("--out", default=None, help="stream per-game results to this JSON-lines file")
+    ap.add_argument("--rng", choices=KINDS, default="mt",
+                    help="per-game food RNG: mt (Mersenne Twister) or counter (splitmix64 of seed, k)")
+    ap.add_argument("--record", default=None, help="write binary game recordings to this file")
+    ap.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = ap.parse_args(argv)
+    try:
+        options = policy.parse_options(args.policy_opt)
+        policy.check_options(options, args.policies)
+    except ValueError as e:
+        ap.error(f"--policy-opt: {e}")
+    for cols, rows in args.sizes:
+        for start_len in args.start_lens:
+            if not 1 <= start_len <= max_start_len(cols):
+                ap.error(f"--start-len {start_len} does not fit a {cols}x{rows} board (1..{max_start_len(cols)})")
+
+    sink = open(args.out, "w", encoding="utf-8") if args.out else None
+    tape = open(args.record, "wb") if args.record else None
+
+    def on_result(res: Result) -> None:
+        if tape is not None:
+            tape.write(res.pop("recording"))
+        if sink is not None:
+            sink.write(json.dumps(res) + "\n")
+
+    t0 = time.perf_counter()
+    try:
+        results = run_tournament(args.games, args.sizes, args.start_lens, args.workers,
+                                 args.seed, args.max_steps, on_result, args.backend,
+                                 args.policies, options,
+                                 record=tape is not None, rng=args.rng)
+    finally:
+        if sink is not None:
+            sink.close()
+        if tape is not None:
+            tape.close()
+    elapsed = time.perf_counter() - t0
+
+    summary = summarize(results)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary, elapsed)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+Snake AI — Heuristic Parameter Autotuner
+
+Searches `ai.HeuristicParams` per board size with successive halving:
+- `configs` candidates: the current defaults plus seeded random draws from
+  `SPACE`, so a run is reproducible,
+- rung 0 plays every candidate on `games` seeds; each following rung keeps
+  the best 1/`eta` and plays `eta` times as many seeds (earlier games are
+  kept, only the new seeds are played). Every candidate of a rung sees the
+  same seeds, i.e. the same food sequences; a size stops as soon as one
+  candidate is left,
+- ranking: win rate, then mean moves to clear (fewer is better), then mean
+  score.
+All games of a rung (every size and candidate) share one process pool
+(`tournament.play`). Prints the best configuration per size as
+`--policy-opt` arguments; `--out` writes every rung as JSON. Fields given
+with `--fixed` are not searched (e.g. `endgame_nodes=20000`).
+
+    python tune.py --sizes 6x6 8x8 10x10 --configs 27 --games 8 --eta 3 --workers 8
+
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from dataclasses import asdict, fields
+from typing import Tuple, List, Dict, Any, Optional, Sequence
+
+from ai import HeuristicParams
+from config import START_LEN
+from headless import max_start_len
+import policy
+from rng import KINDS
+import search
+from tournament import Result, Size, Task, parse_size, play
+
+Config = Dict[str, Any]
+
+# ad -> (alt, üst, tür); diğer alanlar varsayılanında kalır
+SPACE: Dict[str, Tuple[float, float, type]] = {
+    "starve_factor": (1.0, 4.0, float),
+    "stuck_factor": (0.5, 3.0, float),
+    "tail_fill": (0.60, 0.95, float),
+    "finisher_empty": (1, 6, int),
+    "finisher_small_empty": (3, 12, int),
+    "finisher_small_cells": (25, 100, int),
+}
+
+FIELDS = frozenset(f.name for f in fields(HeuristicParams))
+
+def check_fields(names) -> None:
+    """HeuristicParams'ta olmayan adlarda ValueError."""
+    unknown = sorted(set(names) - FIELDS)
+    if unknown:
+        raise ValueError(f"unknown heuristic parameter(s): {', '.join(unknown)}")
+
+check_fields(SPACE)
+
+def sample_configs(n: int, rng: random.Random, fixed: Optional[Config] = None) -> List[Config]:
+    """İlki varsayılanlar (+fixed); kalanlar SPACE'ten rastgele, tekrarsız."""
+    fixed = fixed or {}
+    check_fields(fixed)
+    base = asdict(HeuristicParams(**fixed))
+    configs = [base]
+    seen = {json.dumps(base, sort_keys=True)}
+    tries = 0
+    while len(configs) < n and tries < n * 100:
+        tries += 1
+        cfg = dict(base)
+        for name, (low, high, kind) in SPACE.items():
+            if name in fixed:
+                continue
+            cfg[name] = rng.randint(int(low), int(high)) if kind is int else round(rng.uniform(low, high), 2)
+        key = json.dumps(cfg, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            configs.append(cfg)
+    return configs
+
+def score(results: Sequence[Result]) -> Dict[str, Any]:
+    n = len(results)
+    clears = [r["steps"] for r in results if r["won"]]
+    return {
+        "games": n,
+        "win_rate": len(clears) / n if n else 0.0,
+        "clear_steps_mean": sum(clears) / len(clears) if clears else None,
+        "mean_score": sum(r["score"] for r in results) / n if n else 0.0,
+    }
+
+def rank_key(stats: Dict[str, Any]) -> Tuple[float, float, float]:
+    clear = stats["clear_steps_mean"]
+    return (-stats["win_rate"], clear if clear is not None else float("inf"), -stats["mean_score"])
+
+def tune(sizes: Sequence[Size], configs: Sequence[Config], games: int = 8, eta: int = 3,
+         workers: Optional[int] = None, seed: int = 0, start_len: int = START_LEN,
+         max_steps: Optional[int] = None, backend: str = "python", rng: str = "mt",
+         log=sys.stderr) -> Dict[str, Dict[str, Any]]:
+    """Boyut başına ardışık yarılama; boyut -> {"best", istatistikler, "rungs"}."""
+    alive: Dict[Size, List[int]] = {size: list(range(len(configs))) for size in sizes}
+    played: Dict[Tuple[Size, int], List[Result]] = {}
+    rungs: Dict[Size, List[List[Dict[str, Any]]]] = {size: [] for size in sizes}
+    n_games = games
+    rung = 0
+    active = list(sizes)  # elemesi süren boyutlar; tek aday kalan boyut için oyun planlanmaz
+    while active:
+        # Bu basamakta eksik tohumları tek havuzda oyna
+        tasks: List[Task] = []
+        owners: List[Tuple[Size, int]] = []
+        for size in active:
+            cols, rows = size
+            for cid in alive[size]:
+                have = len(played.setdefault((size, cid), []))
+                for i in range(have, n_games):
+                    tasks.append((seed + i, cols, rows, start_len, max_steps, "heuristic",
+                                  configs[cid], False, rng))
+                    owners.append((size, cid))
+        t0 = time.perf_counter()
+        for owner, res in zip(owners, play(tasks, workers, backend)):
+            played[owner].append(res)
+        print(f"rung {rung}: {len(tasks)} games in {time.perf_counter() - t0:.1f}s "
+              f"({n_games} seeds per candidate)", file=log)
+
+        for size in active:
+            table = [{"config": cid, **score(played[(size, cid)])} for cid in alive[size]]
+            table.sort(key=lambda row: (rank_key(row), row["config"]))
+            rungs[size].append(table)
+            keep = max(1, len(table) // eta)
+            alive[size] = [row["config"] for row in table[:keep]]
+        active = [size for size in active if len(alive[size]) > 1]
+        n_games *= eta
+        rung += 1
+
+    out: Dict[str, Dict[str, Any]] = {}
+    for size in sizes:
+        best = rungs[size][-1][0]
+        default = next((row for table in reversed(rungs[size]) for row in table if row["config"] == 0), None)
+        out[f"{size[0]}x{size[1]}"] = {
+            "best": configs[best["config"]],
+            **{k: v for k, v in best.items() if k != "config"},
+            "default": default,
+            "rungs": [[{**row, "options": configs[row["config"]]} for row in table] for table in rungs[size]],
+        }
+    return out
+
+def format_options(cfg: Config) -> str:
+    """Varsayılandan farklı alanlar (--fixed dahil), --policy-opt biçiminde."""
+    check_fields(cfg)
+    defaults = asdict(HeuristicParams())
+    diff = [f"{k}={v}" for k, v in cfg.items() if v != defaults[k]]
+    return " ".join(diff) if diff else "(defaults)"
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Tune heuristic policy thresholds per board size (successive halving).")
+    ap.add_argument("--sizes", type=parse_size, nargs="+", default=[(6, 6), (8, 8), (10, 10)])
+    ap.add_argument("--configs", type=int, default=27, help="candidates per size (first = defaults)")
+    ap.add_argument("--games", type=int, default=8, help="seeds per candidate in the first rung")
+    ap.add_argument("--eta", type=int, default=3, help="keep 1/eta per rung, eta times more seeds")
+    ap.add_argument("--fixed", nargs="*", default=[], metavar="KEY=VALUE",
+                    help="parameters kept out of the search, e.g. endgame_nodes=20000")
+    ap.add_argument("--workers", type=int, default=None, help="process count (default: all cores)")
+    ap.add_argument("--seed", type=int, default=0, help="first game seed and candidate sampling seed")
+    ap.add_argument("--start-len", type=int, default=START_LEN)
+    ap.add_argument("--max-steps", type=int, default=None, help="per-game step cap (default: cells^2 * 2)")
+    ap.add_argument("--backend", choices=search.BACKENDS, default="python", help="search backend")
+    ap.add_argument("--rng", choices=KINDS, default="mt", help="per-game food RNG")
+    ap.add_argument("--out", default=None, help="write every rung and the best configs as JSON")
+    args = ap.parse_args(argv)
+    if args.eta < 2:
+        ap.error("--eta must be at least 2")
+    for cols, rows in args.sizes:
+        if not 1 <= args.start_len <= max_start_len(cols):
+            ap.error(f"--start-len {args.start_len} does not fit a {cols}x{rows} board (1..{max_start_len(cols)})")
+
+    try:
+        fixed = policy.parse_options(args.fixed)
+        check_fields(fixed)
+    except ValueError as e:
+        ap.error(f"--fixed: {e}")
+    configs = sample_configs(args.configs, random.Random(args.seed), fixed)
+    t0 = time.perf_counter()
+    result = tune(args.sizes, configs, args.games, args.eta, args.workers, args.seed,
+                  args.start_len, args.max_steps, args.backend, args.rng)
+    print(f"\n{len(configs)} candidates tuned in {time.perf_counter() - t0:.1f}s")
+    for key, r in result.items():
+        clear = r["clear_steps_mean"]
+        print(f"\n[{key}] best over {r['games']} games: win={r['win_rate']:.1%}  "
+              f"clear={'-' if clear is None else f'{clear:.0f}'} moves  score={r['mean_score']:.1f}")
+        print(f"  --policy-opt {format_options(r['best'])}")
+        d = r["default"]
+        if d is not None and d["config"] != r["rungs"][-1][0]["config"]:
+            dclear = d["clear_steps_mean"]
+            print(f"  defaults over {d['games']} games: win={d['win_rate']:.1%}  "
+                  f"clear={'-' if dclear is None else f'{dclear:.0f}'} moves")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,54 @@
+"""
+Snake AI — Rendering
+
+`Renderer` draws with dirty rectangles: the floor is baked once into a
+background surface, head/tail sprites are rotated once at load, and each
+frame only the cells whose sprite changed (plus the cells under last
+frame's HUD/overlay text) are restored from the background and redrawn.
+`draw()` returns the rects for `pg.display.update(rects)`; a full redraw
+happens only after `invalidate()` (start, reset).
+
+Sprites come from `load_sprites()`: PNGs are decoded, scaled to `CELL` and
+the tail rotated to all four directions once, then kept as raw RGBA in
+`snake_assets/.cache/sprites_<CELL>.bin`, keyed by `CELL` and every asset's
+mtime. Later launches read that file instead (no PNG decoding, no
+smoothscale); editing an asset or changing `CELL` rebuilds it. pygame is
+only imported on the rendering path (`ui`, `game`, `recording.view`);
+headless code and `main.py --help` never load it.
+
+"""
+
+import json
 import os
+from typing import Dict, List, Iterator, Optional
+
 import pygame as pg
 
 from config import (
-    CELL, COLS, ROWS, WIDTH, HEIGHT, BG_COLOR, TEXT_COL, MARGIN
+    CELL, BG_COLOR, TEXT_COL, MARGIN
 )
-from grid import cell_rect
+from grid import Board, DEFAULT_BOARD
 
 # ---- ASSET YOLU ----
 ASSET_DIR = os.path.join(os.path.dirname(__file__), "snake_assets")
+CACHE_DIR = os.path.join(ASSET_DIR, ".cache")
+CACHE_VERSION = 1
+
+# sprite anahtarı -> snake_assets/<dosya>.png (kuyruk yönleri "tail"dan döndürülür)
+SPRITE_FILES = {
+    "floor": "tile_floor",
+    "wall": "tile_wall",
+    "food": "food_apple",
+    "body": "snake_body_solid",
+    "head_up": "snake_head_solid",
+    "head_down": "down",
+    "head_left": "left",
+    "head_right": "right",
+}
+TAIL_ANGLES = {"tail_right": 0, "tail_left": 180, "tail_down": -90, "tail_up": 90}
+
+def cell_rect(x: int, y: int) -> pg.Rect:
+    return pg.Rect(x * CELL, y * CELL, CELL, CELL)
 
 def load_sprite(name: str) -> pg.Surface:
     """snake_assets/name.png dosyasını yükler, gerekirse CELL boyutuna ölçekler."""
@@ -23,80 +64,207 @@ def load_sprite(name: str) -> pg.Surface:
         img = pg.transform.smoothscale(img, (CELL, CELL))
     return img
 
-def init_ui():
+def build_sprites() -> Dict[str, pg.Surface]:
+    """PNG'lerden: ölçekle, kuyruğun dört yönünü bir kez döndür."""
+    sprites = {key: load_sprite(name) for key, name in SPRITE_FILES.items()}
+    tail = load_sprite("tail")
+    for key, angle in TAIL_ANGLES.items():
+        sprites[key] = pg.transform.rotate(tail, angle) if angle else tail
+    return sprites
+
+def _cache_key() -> Optional[dict]:
+    """CELL + her PNG'nin mtime'ı; bir dosya eksikse None (önbellek kullanılmaz)."""
+    mtimes = {}
+    for name in sorted(set(SPRITE_FILES.values()) | {"tail"}):
+        try:
+            mtimes[name] = os.stat(os.path.join(ASSET_DIR, f"{name}.png")).st_mtime_ns
+        except OSError:
+            return None
+    return {"version": CACHE_VERSION, "cell": CELL, "assets": mtimes}
+
+def load_sprites(cache_dir: Optional[str] = CACHE_DIR) -> Dict[str, pg.Surface]:
+    """
+    Ölçeklenmiş/döndürülmüş sprite'lar; önbellek (ham RGBA, CELL ve mtime
+    anahtarlı) geçerliyse PNG çözme ve smoothscale atlanır, değilse kurulup yazılır.
+    """
+    key = _cache_key()
+    path = os.path.join(cache_dir, f"sprites_{CELL}.bin") if cache_dir and key else None
+    if path is not None:
+        try:
+            with open(path, "rb") as f:
+                header = json.loads(f.readline())
+                if header.get("key") == key:
+                    size = CELL * CELL * 4
+                    return {name: pg.image.fromstring(f.read(size), (CELL, CELL), "RGBA").convert_alpha()
+                            for name in header["names"]}
+        except (OSError, ValueError, pg.error):
+            pass  # bozuk / eski önbellek: yeniden kur
+
+    sprites = build_sprites()
+    if path is not None:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            names = list(sprites)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(json.dumps({"key": key, "names": names}).encode() + b"\n")
+                for name in names:
+                    f.write(pg.image.tostring(sprites[name], "RGBA"))
+            os.replace(tmp, path)  # eşzamanlı başlatmalar yarım dosya görmesin
+        except OSError:
+            pass  # salt okunur kurulum: önbelleksiz devam
+    return sprites
+
+def init_ui(board: Board = DEFAULT_BOARD):
     pg.init()
-    screen = pg.display.set_mode((WIDTH, HEIGHT))
+    screen = pg.display.set_mode((board.cols * CELL, board.rows * CELL))
     pg.display.set_caption("Snake AI - Görsel Modu")
     clock = pg.time.Clock()
     font = pg.font.SysFont(pg.font.get_default_font(), 22, bold=True)
     bigfont = pg.font.SysFont(pg.font.get_default_font(), 42, bold=True)
-
-    sprites = {
-        "floor": load_sprite("tile_floor"),
-        "wall":  load_sprite("tile_wall"),
-        "food":  load_sprite("food_apple"),
-        "body":  load_sprite("snake_body_solid"),
-        "head_up":    load_sprite("snake_head_solid"),
-        "head_down":  load_sprite("down"),
-        "head_left":  load_sprite("left"),
-        "head_right": load_sprite("right"),
-        "tail": load_sprite("tail")
-    }
-
+    sprites = load_sprites()
     return screen, clock, font, bigfont, sprites
 
 # ====== ÇİZİM FONKSİYONLARI ======
 
-def draw_tiles(screen: pg.Surface, spr_floor: pg.Surface):
-    for x in range(COLS):
-        for y in range(ROWS):
-            screen.blit(spr_floor, cell_rect(x, y))
+def build_background(spr_floor: pg.Surface, board: Board = DEFAULT_BOARD) -> pg.Surface:
+    """Zemin karoları tek bir yüzeye bir kez çizilir."""
+    bg = pg.Surface((board.cols * CELL, board.rows * CELL)).convert()
+    bg.fill(BG_COLOR)
+    for x in range(board.cols):
+        for y in range(board.rows):
+            bg.blit(spr_floor, cell_rect(x, y))
+    return bg
 
 def draw_food(screen: pg.Surface, food, spr_food: pg.Surface):
     if food:
         screen.blit(spr_food, cell_rect(*food))
 
+def segment_sprite(snake, k: int) -> str:
+    """k. parçanın sprite anahtarı: baş yönü boyuna, kuyruk yönü önceki parçaya göre."""
+    n = len(snake)
+    x, y = snake[k]
+    if k == 0:
+        if n == 1:
+            return "head_right"
+        nx, ny = snake[1]
+        dx, dy = x - nx, y - ny
+        if dx == 1:    return "head_right"
+        elif dx == -1: return "head_left"
+        elif dy == 1:  return "head_down"
+        return "head_up"
+    if k == n - 1:
+        bx, by = snake[k - 1]
+        dx, dy = bx - x, by - y
+        if dx == 1:    return "tail_right"
+        elif dx == -1: return "tail_left"
+        elif dy == 1:  return "tail_down"
+        return "tail_up"
+    return "body"
+
 def draw_snake(screen: pg.Surface, snake, sprites: dict):
+    n = len(snake)
     for i, (x, y) in enumerate(snake):
-        rect = cell_rect(x, y)
-        if i == 0:
-            if len(snake) > 1:
-                neck = snake[1]
-                dx, dy = x - neck[0], y - neck[1] 
-                if dx == 1:    screen.blit(sprites["head_right"], rect)
-                elif dx == -1: screen.blit(sprites["head_left"], rect)
-                elif dy == 1:  screen.blit(sprites["head_down"], rect)
-                else:          screen.blit(sprites["head_up"], rect)
-            else:
-                screen.blit(sprites["head_right"], rect)
-        elif i == len(snake) - 1:
-            before_tail = snake[i-1]
-            dx, dy = before_tail[0] - x, before_tail[1] - y
-            base_tail = sprites["tail"]
-            if dx == 1:   rotated_tail = base_tail 
-            elif dx == -1: rotated_tail = pg.transform.rotate(base_tail, 180)
-            elif dy == 1:  rotated_tail = pg.transform.rotate(base_tail, -90)
-            else:          rotated_tail = pg.transform.rotate(base_tail, 90)
-            screen.blit(rotated_tail, rect)
+        key = segment_sprite(snake, i) if i == 0 or i == n - 1 else "body"
+        screen.blit(sprites[key], cell_rect(x, y))
+
+class Renderer:
+    def __init__(self, screen: pg.Surface, sprites: dict, font: pg.font.Font, bigfont: pg.font.Font,
+                 board: Board = DEFAULT_BOARD):
+        self.screen = screen
+        self.sprites = sprites
+        self.font = font
+        self.bigfont = bigfont
+        self.board = board
+        self.background = build_background(sprites["floor"], board)
+        self._cells: Dict[int, str] = {}   # hücre -> ekranda duran sprite
+        self._overlay: List[pg.Rect] = []  # son karedeki yazıların alanı
+        self._full = True
+
+    def invalidate(self) -> None:
+        """Bir sonraki kare tüm ekranı yeniden çizsin."""
+        self._full = True
+
+    def _scene(self, game) -> Dict[int, str]:
+        cols = self.board.cols
+        scene: Dict[int, str] = {}
+        if game.food:
+            fx, fy = game.food
+            scene[fy * cols + fx] = "food"
+        snake = game.snake
+        for x, y in snake:
+            scene[y * cols + x] = "body"
+        if len(snake):
+            for k in {0, len(snake) - 1}:
+                x, y = snake[k]
+                scene[y * cols + x] = segment_sprite(snake, k)
+        return scene
+
+    def _cells_under(self, rect: pg.Rect) -> Iterator[int]:
+        cols, rows = self.board.cols, self.board.rows
+        x0, x1 = max(0, rect.left // CELL), min(cols - 1, (rect.right - 1) // CELL)
+        y0, y1 = max(0, rect.top // CELL), min(rows - 1, (rect.bottom - 1) // CELL)
+        for y in range(y0, y1 + 1):
+            for x in range(x0, x1 + 1):
+                yield y * cols + x
+
+    def draw(self, game, seconds: float, perf: str = "") -> List[pg.Rect]:
+        """Sahneyi çiz; değişen ekran alanlarını döndür."""
+        screen = self.screen
+        scene = self._scene(game)
+        prev = self._cells
+        if self._full:
+            screen.blit(self.background, (0, 0))
+            dirty = set(scene)
         else:
-            screen.blit(sprites["body"], rect)
+            dirty = {i for i in scene.keys() | prev.keys() if scene.get(i) != prev.get(i)}
+            for rect in self._overlay:
+                dirty.update(self._cells_under(rect))
+
+        positions = self.board.positions
+        rects: List[pg.Rect] = []
+        for i in dirty:
+            rect = cell_rect(*positions[i])
+            screen.blit(self.background, rect, rect)
+            key = scene.get(i)
+            if key is not None:
+                screen.blit(self.sprites[key], rect)
+            rects.append(rect)
+        self._cells = scene
+
+        overlay = [draw_hud(screen, self.font, game.score, game.hiscore, game.status, seconds, perf)]
+        if game.paused and game.alive:
+            overlay.append(draw_pause(screen, self.bigfont))
+        if not game.alive:
+            overlay.append(draw_gameover(screen, self.bigfont, self.font))
+        self._overlay = overlay
+
+        if self._full:
+            self._full = False
+            return [screen.get_rect()]
+        return rects + overlay
 
 # --- GÜNCELLENEN KISIM BURASI ---
-def draw_hud(screen: pg.Surface, font: pg.font.Font, score: int, hiscore: int, status: str, seconds: float):
+def draw_hud(screen: pg.Surface, font: pg.font.Font, score: int, hiscore: int, status: str, seconds: float,
+             perf: str = "") -> pg.Rect:
     # Süreyi virgülden sonra 1 basamak (ör: 12.5s) gösterecek şekilde formatladık
-    info = f"Time: {seconds:.1f}s   Score: {score}   High: {hiscore}   AI: {status}   [P]ause [R]estart"
+    info = f"Time: {seconds:.1f}s   Score: {score}   High: {hiscore}   AI: {status}   [P]ause [R]estart [I]nstrument"
     text = font.render(info, True, TEXT_COL)
-    screen.blit(text, (8, 6))
+    rect = screen.blit(text, (8, 6))
+    # Ölçüm açıksa (instrument) ikinci satırda tick süresi / BFS sayısı
+    if perf:
+        rect = rect.union(screen.blit(font.render(perf, True, TEXT_COL), (8, 6 + font.get_linesize())))
+    return rect
 
-def draw_pause(screen: pg.Surface, bigfont: pg.font.Font):
+def draw_pause(screen: pg.Surface, bigfont: pg.font.Font) -> pg.Rect:
     label = bigfont.render("PAUSED", True, TEXT_COL)
-    rect = label.get_rect(center=(WIDTH//2, HEIGHT//2))
-    screen.blit(label, rect)
+    rect = label.get_rect(center=screen.get_rect().center)
+    return screen.blit(label, rect)
 
-def draw_gameover(screen: pg.Surface, bigfont: pg.font.Font, font: pg.font.Font):
+def draw_gameover(screen: pg.Surface, bigfont: pg.font.Font, font: pg.font.Font) -> pg.Rect:
     over = bigfont.render("GAME OVER", True, TEXT_COL)
     tip  = font.render("Press R to restart", True, TEXT_COL)
-    over_rect = over.get_rect(center=(WIDTH//2, HEIGHT//2 - 18))
-    tip_rect  = tip.get_rect(center=(WIDTH//2, HEIGHT//2 + 18))
-    screen.blit(over, over_rect)
-    screen.blit(tip, tip_rect)
\ No newline at end of file
+    cx, cy = screen.get_rect().center
+    over_rect = over.get_rect(center=(cx, cy - 18))
+    tip_rect  = tip.get_rect(center=(cx, cy + 18))
+    return screen.blit(over, over_rect).union(screen.blit(tip, tip_rect))
@@ -0,0 +1,76 @@
+"""
+Snake AI — Zobrist Body Hashing
+
+Shared by the tree searches (`lookahead`, `endgame`), which walk a private
+`SnakeBody` copy in place and key their tables on the ordered body:
+- `zobrist_keys` gives one 64-bit key per (cell, direction to the next
+  segment) plus a head mark per cell, and one per food cell; fixed seed,
+  built once per board size,
+- `body_hash` hashes a whole body; `advance` / `undo` move the head one
+  step (dropping the tail unless growing) and back, updating the hash
+  incrementally,
+- `legal_moves` lists head moves that do not hit the body (the tail cell is
+  allowed unless the snake eats there),
+- `Timeout` is raised by the searches when their budget runs out.
+
+"""
+
+import random
+from functools import lru_cache
+from typing import Tuple, List, Optional, Sequence
+
+from state import SnakeBody
+
+HEAD = 4  # segment anahtarında baş işareti (0..3 = sonraki parçanın yönü)
+
+class Timeout(Exception):
+    pass
+
+@lru_cache(maxsize=None)
+def zobrist_keys(cols: int, rows: int, seed: int = 0x5EED) -> Tuple[Tuple[Tuple[int, ...], ...], Tuple[int, ...]]:
+    """(segment[cell][yön/baş], yem[cell]) 64-bit anahtarları; tahta boyutu başına bir kez."""
+    rng = random.Random(seed)
+    cells = cols * rows
+    seg = tuple(tuple(rng.getrandbits(64) for _ in range(5)) for _ in range(cells))
+    food = tuple(rng.getrandbits(64) for _ in range(cells))
+    return seg, food
+
+def direction(a: int, b: int, cols: int) -> int:
+    """a'dan komşu b'ye yön: +x, -x, +y, -y -> 0..3"""
+    d = b - a
+    if d == 1:
+        return 0
+    if d == -1:
+        return 1
+    return 2 if d == cols else 3
+
+def body_hash(snake: SnakeBody) -> int:
+    seg, _ = zobrist_keys(snake.cols, snake.rows)
+    cells = snake.indices()
+    h = seg[cells[0]][HEAD]
+    for nxt, c in zip(cells, cells[1:]):
+        h ^= seg[c][direction(c, nxt, snake.cols)]
+    return h
+
+def advance(seg: Sequence[Tuple[int, ...]], snake: SnakeBody, j: int, grow: bool, h: int) -> Tuple[int, int]:
+    """Başı j'ye taşı (grow değilse kuyruk düşer); (yeni hash, düşen kuyruk veya -1)."""
+    cols = snake.cols
+    t = -1
+    if not grow:
+        t = snake.pop_tail()
+        h ^= seg[t][direction(t, snake.tail_idx, cols)]
+    old = snake.head_idx
+    h ^= seg[old][HEAD] ^ seg[old][direction(old, j, cols)] ^ seg[j][HEAD]
+    snake.push_head(j)
+    return h, t
+
+def undo(snake: SnakeBody, t: int) -> None:
+    """advance'ın tersi (t: advance'ın döndürdüğü kuyruk)."""
+    snake.pop_head()
+    if t >= 0:
+        snake.push_tail(t)
+
+def legal_moves(snake: SnakeBody, food: Optional[int]) -> List[int]:
+    tail = snake.tail_idx
+    return [j for j in snake.adj[snake.head_idx]
+            if not snake.occ[j] or (j == tail and j != food and len(snake) > 1)]